@@ -0,0 +1,63 @@
+import random
+from typing import List
+from bill_autoreader.std.retailer import collect_all_tariffs, RETAILERS_TARIFFS
+
+ACCENTS = {"a": "á", "e": "é", "i": "í", "o": "ö", "u": "ü", "c": "ç"}
+NOISE_SUFFIXES = [
+    " (kWh)",
+    " - 01/10/2023 to 31/10/2023",
+    " ^",
+    " *",
+    " 12.5c/kWh",
+    " (GST incl.)",
+    " Block 1",
+]
+
+
+def _vary_case(label: str, rng: random.Random) -> str:
+    choice = rng.random()
+    if choice < 0.2:
+        return label.upper()
+    if choice < 0.4:
+        return label.lower()
+    if choice < 0.5:
+        return "".join(c.upper() if rng.random() < 0.5 else c.lower() for c in label)
+    return label
+
+
+def _add_accents(label: str, rng: random.Random) -> str:
+    return "".join(
+        ACCENTS[c] if c in ACCENTS and rng.random() < 0.3 else c for c in label
+    )
+
+
+def make_label(label: str, rng: random.Random) -> str:
+    """Returns a production-like variant of a known retailer tariff name."""
+    label = _vary_case(label, rng)
+    if rng.random() < 0.1:
+        label = _add_accents(label, rng)
+    if rng.random() < 0.3:
+        label += rng.choice(NOISE_SUFFIXES)
+    if rng.random() < 0.1:
+        label = f"  {label}  "
+    return label
+
+
+def build_corpus(size: int, seed: int = 0, exact_share: float = 0.6) -> List[str]:
+    """
+    Builds a corpus of tariff names from ``RETAILERS_TARIFFS``.
+
+    A share of the names are copied as is, like most production traffic; the
+    others get casing, unicode, whitespace and suffix noise.
+    """
+    rng = random.Random(seed)
+    known = sorted(collect_all_tariffs(RETAILERS_TARIFFS))
+    return [
+        label if rng.random() < exact_share else make_label(label, rng)
+        for label in (rng.choice(known) for _ in range(size))
+    ]
+
+
+def split_into_bills(labels: List[str], bill_size: int = 40) -> List[List[str]]:
+    """Groups a corpus into bills of ``bill_size`` line items."""
+    return [labels[i : i + bill_size] for i in range(0, len(labels), bill_size)]
@@ -0,0 +1,83 @@
+"""
+Thread scaling benchmark of the tariff standardization path.
+
+Usage:
+    python -m benchmarks.std_threads --size 200000 --threads 1 2 4 8 --output threads.json
+
+One shared classifier standardizes the same corpus split into bills across a
+thread pool of each size. On free-threaded builds (e.g. CPython 3.13t) the
+throughput should grow with the number of threads; with the GIL enabled it
+stays roughly flat.
+
+Only GIL builds have been benchmarked so far: the scaling on a free-threaded
+build is expected from the design but unverified.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Dict, List, Optional
+from bill_autoreader.std import get_classifier, map_to_standardize_tariffs
+from benchmarks.corpus import build_corpus, split_into_bills
+
+
+def run_threads(bills: List[List[str]], n_threads: int) -> float:
+    """Standardizes all bills on a pool of ``n_threads``, returning the seconds taken."""
+    with ThreadPoolExecutor(max_workers=n_threads) as executor:
+        start = perf_counter()
+        list(executor.map(map_to_standardize_tariffs, bills))
+        return perf_counter() - start
+
+
+def run_benchmark(size: int, threads: List[int], seed: int = 0) -> Dict:
+    bills = split_into_bills(build_corpus(size, seed=seed))
+    get_classifier()  # compile outside of the timed runs
+
+    results = []
+    baseline = None
+    for n_threads in threads:
+        seconds = run_threads(bills, n_threads)
+        if baseline is None:
+            baseline = seconds
+        results.append(
+            {
+                "threads": n_threads,
+                "seconds": seconds,
+                "labels_per_second": size / seconds,
+                "speedup": baseline / seconds,
+            }
+        )
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "gil_enabled": is_gil_enabled() if is_gil_enabled else True,
+        "size": size,
+        "seed": seed,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="JSON file to write, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(args.size, args.threads, args.seed)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
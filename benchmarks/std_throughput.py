@@ -0,0 +1,160 @@
+"""
+Throughput benchmark of the tariff standardization path.
+
+Usage:
+    python -m benchmarks.std_throughput --sizes 1000 100000 1000000 --output bench.json
+
+Each engine classifies the same corpus; the JSON output lists labels/second
+and per-label latency percentiles per engine and corpus size, so results can
+be compared release over release.
+"""
+
+import argparse
+import json
+import platform
+import sys
+from time import perf_counter
+from typing import Callable, Dict, List, Optional
+from bill_autoreader.constants import ENERGY_CONSUMPTION_TARIFF
+from bill_autoreader.std import (
+    LabelCache,
+    TariffClassifier,
+    identify_tariffs,
+    map_to_standardize_tariffs,
+    map_to_standardize_tariffs_batch,
+    map_to_standardize_tariffs_bulk,
+)
+from benchmarks.corpus import build_corpus, split_into_bills
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def percentiles(latencies: List[float]) -> Dict[str, Optional[float]]:
+    """Returns p50/p90/p99/max of per-label latencies, in microseconds."""
+    if not latencies:
+        return {"p50_us": None, "p90_us": None, "p99_us": None, "max_us": None}
+    ordered = sorted(latencies)
+    last = len(ordered) - 1
+
+    def at(share: float) -> float:
+        return ordered[min(last, int(share * len(ordered)))] * 1e6
+
+    return {
+        "p50_us": at(0.50),
+        "p90_us": at(0.90),
+        "p99_us": at(0.99),
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def per_label(classify: Callable[[str], Optional[str]]):
+    def run(labels: List[str], bills: List[List[str]]) -> List[float]:
+        latencies = []
+        for label in labels:
+            start = perf_counter()
+            classify(label)
+            latencies.append(perf_counter() - start)
+        return latencies
+
+    return run
+
+
+def per_bill(standardize: Callable[[List[str]], object]):
+    def run(labels: List[str], bills: List[List[str]]) -> List[float]:
+        latencies = []
+        for bill in bills:
+            start = perf_counter()
+            standardize(bill)
+            latencies.extend([(perf_counter() - start) / len(bill)] * len(bill))
+        return latencies
+
+    return run
+
+
+def whole_corpus(standardize: Callable[[List[str], List[List[str]]], object]):
+    def run(labels: List[str], bills: List[List[str]]) -> List[float]:
+        standardize(labels, bills)
+        return []
+
+    return run
+
+
+def identify_all_fields(bill: List[str]) -> None:
+    for std_tariff in ENERGY_CONSUMPTION_TARIFF:
+        identify_tariffs(bill, std_tariff)
+
+
+ENGINES = {
+    "identify_tariffs": lambda: per_bill(identify_all_fields),
+    "map_to_standardize_tariffs": lambda: per_bill(map_to_standardize_tariffs),
+    "classifier.patterns": lambda: per_label(
+        TariffClassifier(retailers_tariffs=None).classify
+    ),
+    "classifier.index": lambda: per_label(TariffClassifier().classify),
+    "classifier.cache": lambda: per_label(
+        TariffClassifier(cache=LabelCache()).classify
+    ),
+    "map_to_standardize_tariffs_batch": lambda: whole_corpus(
+        lambda labels, bills: map_to_standardize_tariffs_batch(bills)
+    ),
+    "map_to_standardize_tariffs_bulk": lambda: whole_corpus(
+        lambda labels, bills: map_to_standardize_tariffs_bulk(labels)
+    ),
+}
+
+
+def run_benchmarks(
+    sizes: List[int], engines: List[str], seed: int = 0, bill_size: int = 40
+) -> Dict:
+    """Runs every engine on a corpus of each size and collects the results."""
+    results = []
+    for size in sizes:
+        labels = build_corpus(size, seed=seed)
+        bills = split_into_bills(labels, bill_size)
+        for engine in engines:
+            run = ENGINES[engine]()
+            start = perf_counter()
+            latencies = run(labels, bills)
+            elapsed = perf_counter() - start
+            results.append(
+                {
+                    "engine": engine,
+                    "size": size,
+                    "seconds": elapsed,
+                    "labels_per_second": size / elapsed if elapsed else None,
+                    **percentiles(latencies),
+                }
+            )
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "seed": seed,
+        "bill_size": bill_size,
+        "results": results,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument(
+        "--engines", nargs="+", choices=sorted(ENGINES), default=list(ENGINES)
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bill-size", type=int, default=40)
+    parser.add_argument("--output", help="JSON file to write, defaults to stdout")
+    args = parser.parse_args(argv)
+
+    report = run_benchmarks(args.sizes, args.engines, args.seed, args.bill_size)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+            file.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
@@ -67,3 +67,4 @@ SUPPLY_DISCOUNT = "supply_discount"
 
 GST_RATE = 1.1
 NONE_DEMAND = [None, 999, "999", "", Decimal(999), Decimal("999"), 0, nan, np.nan]
+SUMMER_MONTHS = [12, 1, 2, 3]  # December, January, February, March in Australia
@@ -0,0 +1,154 @@
+import re
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Dict, Hashable, Iterable, List, Optional, Pattern, Union
+from bill_autoreader.std.patterns import TariffPatterns
+
+MONTH_ABBREVIATIONS = [
+    "jan", "feb", "mar", "apr", "may", "jun",
+    "jul", "aug", "sep", "oct", "nov", "dec",
+]  # fmt: skip
+MONTH_NAMES = [
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+]  # fmt: skip
+_MONTHS = {
+    **{name: i for i, name in enumerate(MONTH_ABBREVIATIONS, 1)},
+    **{name: i for i, name in enumerate(MONTH_NAMES, 1)},
+}
+
+# Same component regexes as ``datetime.strptime`` in the C locale.
+_DIRECTIVES = {
+    "d": r"(?P<day>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+    "m": r"(?P<month>1[0-2]|0[1-9]|[1-9])",
+    "b": r"(?P<month_name>%s)" % "|".join(MONTH_ABBREVIATIONS),
+    "B": r"(?P<month_name>%s)" % "|".join(MONTH_NAMES),
+    "Y": r"(?P<year>\d\d\d\d)",
+    "y": r"(?P<short_year>\d\d)",
+}
+
+
+@lru_cache(maxsize=None)
+def compile_date_format(date_format: str) -> Pattern:
+    """
+    Translates a ``strptime`` format using ``%d``, ``%m``, ``%b``, ``%B``,
+    ``%Y`` and ``%y`` into a regex extracting the date components, accepting
+    the same strings as ``datetime.strptime``.
+    """
+    parts = []
+    for literal, directive in re.findall(r"([^%]*)(?:%(.))?", date_format):
+        # strptime lets any run of whitespace in the format match \s+
+        parts.append(r"\s+".join(map(re.escape, re.split(r"\s+", literal))))
+        if directive:
+            if directive not in _DIRECTIVES:
+                raise ValueError(f"Unsupported date directive: %{directive}")
+            parts.append(_DIRECTIVES[directive])
+    return re.compile("".join(parts), re.IGNORECASE)
+
+
+def _to_date(match: "re.Match") -> date:
+    components = match.groupdict()
+    if components.get("year") is not None:
+        year = int(components["year"])
+    else:
+        # strptime maps 69-99 to 1969-1999 and 00-68 to 2000-2068
+        short_year = int(components["short_year"])
+        year = short_year + (1900 if short_year >= 69 else 2000)
+    if components.get("month") is not None:
+        month = int(components["month"])
+    else:
+        month = _MONTHS[components["month_name"].lower()]
+    return date(year, month, int(components["day"]))
+
+
+def parse_date(value: str, date_format: str) -> Optional[date]:
+    """
+    Parses a date string with a ``strptime`` format, returning None when the
+    string does not follow the format or is not a valid date.
+    """
+    # Like strptime, the first match must consume the whole string.
+    match = compile_date_format(date_format).match(value)
+    if match is None or match.end() != len(value):
+        return None
+    try:
+        return _to_date(match)
+    except ValueError:
+        return None
+
+
+def detect_date_format(
+    value: str, date_formats: Optional[List[str]] = None
+) -> Optional[str]:
+    """
+    Returns the first format, by default from ``TariffPatterns.START_DATE``,
+    that parses a date string, or None when none does.
+    """
+    for date_format in date_formats or TariffPatterns.START_DATE:
+        if parse_date(value, date_format) is not None:
+            return date_format
+    return None
+
+
+class BillingDateParser:
+    """
+    Parses billing dates, detecting the format once per retailer or document.
+
+    The detected format is cached under the key given to ``parse`` or
+    ``parse_many`` (e.g. a retailer name), and later dates with the same key
+    are parsed by a single regex match. A date that does not follow the
+    cached format is detected again, and its format replaces the cached one.
+
+    Parameters
+    ----------
+    date_formats : List[str], optional
+        Candidate ``strptime`` formats, in order of preference. Defaults to
+        ``TariffPatterns.START_DATE``.
+    """
+
+    def __init__(self, date_formats: Optional[List[str]] = None):
+        self.date_formats = list(date_formats or TariffPatterns.START_DATE)
+        for date_format in self.date_formats:
+            compile_date_format(date_format)
+        self._formats: Dict[Hashable, str] = {}
+        self._lock = threading.Lock()
+
+    def cached_format(self, key: Hashable) -> Optional[str]:
+        """Returns the format detected for a key, if any."""
+        return self._formats.get(key)
+
+    def parse(
+        self, value: Union[str, date, None], key: Hashable = None
+    ) -> Optional[date]:
+        """
+        Parses one date string, returning None for empty or unparseable values.
+        """
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        if not value:
+            return None
+        value = value.strip()
+        date_format = self._formats.get(key)
+        if date_format is not None:
+            parsed = parse_date(value, date_format)
+            if parsed is not None:
+                return parsed
+
+        for date_format in self.date_formats:
+            parsed = parse_date(value, date_format)
+            if parsed is not None:
+                with self._lock:
+                    self._formats[key] = date_format
+                return parsed
+        return None
+
+    def parse_many(
+        self, values: Iterable[Union[str, date, None]], key: Hashable = None
+    ) -> List[Optional[date]]:
+        """
+        Parses a column of date strings sharing one format, detecting it from
+        the first parseable value when the key has no cached format yet.
+        """
+        return [self.parse(value, key) for value in values]
@@ -1,12 +1,37 @@
 import math
-from datetime import date
+import threading
+import numpy as np
+from contextlib import contextmanager
+from datetime import date, timedelta
+from time import perf_counter
 from bill_autoreader.utils import (
+    DateArray,
     calculate_months_between_dates,
+    calculate_months_between_dates_array,
+    days_between_dates_inclusive,
+    to_datetime64_days,
     to_list,
     combine_into_list,
+    is_none_demand_array,
+    to_demand_array,
+)
+from bill_autoreader.constants import SUMMER_DEMAND, NONSUMMER_DEMAND, SUMMER_MONTHS
+from typing import (
+    Union,
+    List,
+    Dict,
+    TypedDict,
+    Optional,
+    Sequence,
+    Hashable,
+    Mapping,
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Tuple,
 )
-from bill_autoreader.constants import SUMMER_DEMAND, NONSUMMER_DEMAND
-from typing import Union, List, Dict, TypedDict, Optional
 
 
 class DemandPriceUnitEnum:
@@ -15,6 +40,82 @@ class DemandPriceUnitEnum:
     unknown = "unknown"
 
 
+# Price units indexed by the codes returned by ``demand_price_unit_array``.
+DEMAND_PRICE_UNITS = (
+    DemandPriceUnitEnum.price_per_usage,
+    DemandPriceUnitEnum.price_per_usage_per_day,
+    DemandPriceUnitEnum.unknown,
+)
+PRICE_PER_USAGE_CODE, PRICE_PER_USAGE_PER_DAY_CODE, UNKNOWN_CODE = range(3)
+
+
+class DemandTraceEvent(NamedTuple):
+    """
+    An event passed to the hooks registered with ``add_demand_hook``.
+
+    Attributes:
+    - name (str): "demand_structure" once per bill analyzed by ``get_demand_structure``,
+      "demand_multipliers" once per season whose multipliers it computes and
+      "demand_structure_batch" once per call of ``get_demand_structure_batch``.
+    - data (Dict[str, Any]): The inputs of the event and, for "demand_structure", its result.
+    - seconds (Optional[float]): Time spent, for the "demand_structure" and
+      "demand_structure_batch" events.
+    """
+
+    name: str
+    data: Dict[str, Any]
+    seconds: Optional[float] = None
+
+
+DemandHook = Callable[[DemandTraceEvent], None]
+
+# Copied on write, so the demand functions read it without locking and do
+# nothing more than this emptiness check while no hook is registered.
+_DEMAND_HOOKS: Tuple[DemandHook, ...] = ()
+_DEMAND_HOOKS_LOCK = threading.Lock()
+
+
+def add_demand_hook(hook: DemandHook) -> None:
+    """
+    Registers a function called with a ``DemandTraceEvent`` for each event of
+    the demand functions. Hooks run synchronously, in registration order.
+    """
+    global _DEMAND_HOOKS
+    with _DEMAND_HOOKS_LOCK:
+        _DEMAND_HOOKS = _DEMAND_HOOKS + (hook,)
+
+
+def remove_demand_hook(hook: DemandHook) -> None:
+    """Unregisters a hook added with ``add_demand_hook``, if registered."""
+    global _DEMAND_HOOKS
+    with _DEMAND_HOOKS_LOCK:
+        hooks = list(_DEMAND_HOOKS)
+        if hook in hooks:
+            hooks.remove(hook)
+        _DEMAND_HOOKS = tuple(hooks)
+
+
+@contextmanager
+def demand_tracing(hook: DemandHook) -> Iterator[DemandHook]:
+    """Registers a hook for the duration of a ``with`` block."""
+    add_demand_hook(hook)
+    try:
+        yield hook
+    finally:
+        remove_demand_hook(hook)
+
+
+def _emit(
+    hooks: Tuple[DemandHook, ...],
+    name: str,
+    data: Dict[str, Any],
+    seconds: Optional[float] = None,
+) -> None:
+    event = DemandTraceEvent(name, data, seconds)
+    for hook in hooks:
+        hook(event)
+
+
 def demand_price_unit(
     demand_usage: float,
     demand_price: float,
@@ -68,6 +169,70 @@ def demand_price_unit(
             return DemandPriceUnitEnum.unknown
 
 
+def _isclose_array(a: np.ndarray, b: np.ndarray, abs_tol: float) -> np.ndarray:
+    """Element-wise ``math.isclose(a, b, abs_tol=abs_tol)`` with its default rel_tol."""
+    with np.errstate(invalid="ignore", over="ignore"):
+        diff = np.abs(a - b)
+        tolerance = np.maximum(1e-09 * np.maximum(np.abs(a), np.abs(b)), abs_tol)
+        return (a == b) | (np.isfinite(diff) & (diff <= tolerance))
+
+
+def _billing_days_array(billing_days) -> np.ndarray:
+    """Billing days as floats, 0 where they are not provided (None or 0)."""
+    days = np.asarray(billing_days)
+    if days.dtype == object:
+        days = np.where(np.vectorize(bool, otypes=[bool])(days), days, 0)
+    return days.astype(float)
+
+
+def demand_price_unit_array(
+    demand_usages: Sequence[float],
+    demand_prices: Sequence[float],
+    demand_true_subtotals: Sequence[float],
+    billing_days: Union[int, Sequence[Optional[int]], None] = None,
+    loss_factor: Union[float, Sequence[float]] = 1,
+    abs_tol: float = 0.01,
+) -> np.ndarray:
+    """
+    Vectorized ``demand_price_unit`` over arrays of demand values, with the same
+    tolerance semantics as ``math.isclose``.
+
+    Parameters:
+    - demand_usages (Sequence[float]): The usage of each demand value.
+    - demand_prices (Sequence[float]): The price per unit of usage of each demand value.
+    - demand_true_subtotals (Sequence[float]): The subtotal of each demand value.
+    - billing_days (int or Sequence[Optional[int]], optional): Billing days, per demand value or shared;
+      None or 0 means not provided, as in ``demand_price_unit``.
+    - loss_factor (float or Sequence[float], optional): Loss factor, per demand value or shared.
+    - abs_tol (float, optional): Absolute tolerance used for comparing floating point numbers.
+
+    Returns:
+    - np.ndarray: One code per demand value, indexing ``DEMAND_PRICE_UNITS``.
+    """
+    usages = np.asarray(demand_usages, dtype=float)
+    prices = np.asarray(demand_prices, dtype=float)
+    subtotals = np.asarray(demand_true_subtotals, dtype=float)
+    with np.errstate(invalid="ignore", over="ignore"):
+        usage_price_subtotals = usages * prices * np.asarray(loss_factor, dtype=float)
+
+    is_price_per_usage = _isclose_array(usage_price_subtotals, subtotals, abs_tol)
+    codes = np.where(
+        is_price_per_usage, PRICE_PER_USAGE_CODE, PRICE_PER_USAGE_PER_DAY_CODE
+    ).astype(np.int8)
+    if billing_days is None:
+        return codes
+
+    days = _billing_days_array(billing_days)
+    has_days = np.broadcast_to(days != 0, codes.shape)
+    with np.errstate(invalid="ignore", over="ignore"):
+        usage_price_subtotals_per_day = usage_price_subtotals * days
+    is_price_per_usage_per_day = _isclose_array(
+        usage_price_subtotals_per_day, subtotals, abs_tol
+    )
+    codes[has_days & ~is_price_per_usage & ~is_price_per_usage_per_day] = UNKNOWN_CODE
+    return codes
+
+
 def is_monthly_demand(
     all_demand: Union[float, list],
     start_period: date = None,
@@ -137,6 +302,10 @@ def get_demand_structure(
     Returns:
     - dict: Dictionary with details about demand validation, price unit, and multipliers.
     """
+    hooks = _DEMAND_HOOKS
+    if hooks:
+        started = perf_counter()
+
     results = {
         "monthly_demand": False,
         "price_unit": DemandPriceUnitEnum.price_per_usage,
@@ -184,22 +353,556 @@ def get_demand_structure(
         for demand_name, demand_val in zip(
             demand_names, [nonsummer_demand, summer_demand]
         ):
-            print("demand_val", demand_val)
+            if hooks:
+                _emit(
+                    hooks,
+                    "demand_multipliers",
+                    {"demand_name": demand_name, "demand": demand_val},
+                )
             results["multipliers"][demand_name] = get_demand_multiplier(
                 to_list(demand_val["usage"]),
                 to_list(demand_val["price"]),
                 to_list(demand_val["subtotal"]),
             )
 
+    if hooks:
+        _emit(
+            hooks,
+            "demand_structure",
+            {
+                "nonsummer_demand": nonsummer_demand,
+                "summer_demand": summer_demand,
+                "start_date": start_date,
+                "end_date": end_date,
+                "loss_factor": loss_factor,
+                "result": results,
+            },
+            perf_counter() - started,
+        )
     return results
 
 
+def _round_multipliers(ratios: np.ndarray) -> np.ndarray:
+    """
+    ``int(round(ratio, 2))`` of finite ratios below 2**63 in magnitude, as int64.
+    """
+    multipliers = np.trunc(ratios).astype(np.int64)
+    rounded = np.rint(ratios)
+    # Rounding to 2 decimals only changes the truncated integer just below
+    # (above when negative) an integer; those ratios go through the Python
+    # expression instead.
+    near_integer = (ratios != rounded) & (np.abs(ratios - rounded) <= 0.0051)
+    for index in np.flatnonzero(near_integer):
+        multipliers[index] = int(round(float(ratios[index]), 2))
+    return multipliers
+
+
+def _demand_multiplier_array(
+    usages: np.ndarray, prices: np.ndarray, subtotals: np.ndarray
+) -> np.ndarray:
+    """
+    Vectorized ``get_demand_multiplier`` returning Python ints, raising
+    like it when a usage times price is 0 or a ratio is not finite.
+    """
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        ratios = subtotals / (usages * prices)
+    if not np.all(np.isfinite(ratios)):
+        # Raise the error of the first failing row, as the Python loop does
+        get_demand_multiplier(usages.tolist(), prices.tolist(), subtotals.tolist())
+    in_range = np.abs(ratios) < 2**63
+    multipliers = np.zeros(len(ratios), dtype=object)
+    multipliers[in_range] = _round_multipliers(ratios[in_range]).tolist()
+    for index in np.flatnonzero(~in_range):
+        multipliers[index] = int(round(float(ratios[index]), 2))
+    return multipliers
+
+
+class DemandMultipliers(NamedTuple):
+    """
+    Attributes:
+    - multipliers (np.ndarray): int64 multiplier of each demand row, 0 where it is not valid.
+    - valid (np.ndarray): Whether each row has a usage, price and subtotal to compute it from.
+    """
+
+    multipliers: np.ndarray
+    valid: np.ndarray
+
+
+def demand_multiplier_array(
+    usages: Sequence[Any],
+    prices: Sequence[Any],
+    subtotals: Sequence[Any],
+) -> DemandMultipliers:
+    """
+    Vectorized ``get_demand_multiplier`` over the demand rows of any number of bills,
+    masking the rows it would fail on instead of raising.
+
+    A row is not valid when its usage, price or subtotal means no demand (see
+    ``is_none_demand``: None, "", "999", NaN, 0 or 999), or when its multiplier
+    is not a finite int64. Valid rows get ``int(round(subtotal / (usage * price), 2))``.
+
+    Parameters:
+    - usages (Sequence[Any]): Usage of each demand row.
+    - prices (Sequence[Any]): Price of each demand row.
+    - subtotals (Sequence[Any]): Subtotal of each demand row.
+
+    Returns:
+    - DemandMultipliers: The multipliers and validity mask of the rows.
+    """
+    # No demand values become NaN, and so do their ratios
+    usages = to_demand_array(usages)
+    prices = to_demand_array(prices)
+    subtotals = to_demand_array(subtotals)
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        ratios = subtotals / (usages * prices)
+        valid = np.isfinite(ratios) & (np.abs(ratios) < 2**63)
+    multipliers = np.zeros(len(ratios), dtype=np.int64)
+    multipliers[valid] = _round_multipliers(ratios[valid])
+    return DemandMultipliers(multipliers, valid)
+
+
+def _multiplier_error(
+    usages: np.ndarray,
+    prices: np.ndarray,
+    subtotals: np.ndarray,
+    seasons: Sequence[slice],
+) -> Exception:
+    """The error ``get_demand_structure`` raises on the multipliers of one bill."""
+    try:
+        for rows in seasons:
+            get_demand_multiplier(
+                usages[rows].tolist(), prices[rows].tolist(), subtotals[rows].tolist()
+            )
+    except (ZeroDivisionError, ValueError, OverflowError) as error:
+        return error
+    raise AssertionError("The multipliers of the bill can be computed")
+
+
+def get_demand_structure_batch(
+    bill_ids: Sequence[Hashable],
+    is_summer: Sequence[bool],
+    usages: Sequence[float],
+    prices: Sequence[float],
+    subtotals: Sequence[float],
+    start_dates: Optional[Mapping[Hashable, date]] = None,
+    end_dates: Optional[Mapping[Hashable, date]] = None,
+    loss_factors: Union[float, Mapping[Hashable, float]] = 1.0,
+    errors: Optional[Dict[Hashable, Exception]] = None,
+) -> Dict[Hashable, DemandStructureResponse]:
+    """
+    Batch ``get_demand_structure`` over a columnar table of demand rows of many bills,
+    one row per demand value.
+
+    Rows of a bill need not be contiguous; within a bill and season they are
+    taken in table order, as the values of the per-bill demand lists.
+
+    A bill for which ``get_demand_structure`` would raise, because a multiplier
+    cannot be computed (e.g. a zero usage or price), is left out of the result
+    without affecting the other bills.
+
+    Parameters:
+    - bill_ids (Sequence[Hashable]): The bill of each row.
+    - is_summer (Sequence[bool]): Whether each row is a summer or a non-summer demand value.
+    - usages (Sequence[float]): The usage of each row.
+    - prices (Sequence[float]): The price of each row.
+    - subtotals (Sequence[float]): The subtotal of each row.
+    - start_dates (Mapping[Hashable, date], optional): Start date of the billing period per bill.
+    - end_dates (Mapping[Hashable, date], optional): End date of the billing period per bill.
+    - loss_factors (float or Mapping[Hashable, float], optional): Loss factor, shared or per bill.
+    - errors (Dict[Hashable, Exception], optional): Filled with the error of each bill left out.
+
+    Returns:
+    - Dict[Hashable, DemandStructureResponse]: The demand structure of each bill,
+      in order of first appearance, equal to what ``get_demand_structure`` returns.
+    """
+    if len(bill_ids) == 0:
+        return {}
+    hooks = _DEMAND_HOOKS
+    if hooks:
+        started = perf_counter()
+    start_dates = start_dates or {}
+    end_dates = end_dates or {}
+    # Bill codes in order of first appearance, keeping the ids as given
+    index = {}
+    bill_codes = np.fromiter(
+        (index.setdefault(bill_id, len(index)) for bill_id in bill_ids),
+        dtype=np.int64,
+        count=len(bill_ids),
+    )
+    ids = list(index)
+    summer = np.asarray(is_summer, dtype=bool)
+    # Non-summer rows of a bill come before its summer rows, as in get_demand_structure
+    order = np.argsort(bill_codes * 2 + summer, kind="stable")
+    bill_codes = bill_codes[order]
+    summer = summer[order]
+    usages = np.asarray(usages, dtype=float)[order]
+    prices = np.asarray(prices, dtype=float)[order]
+    subtotals = np.asarray(subtotals, dtype=float)[order]
+
+    if isinstance(loss_factors, Mapping):
+        bill_loss_factors = np.array(
+            [loss_factors.get(bill_id, 1.0) for bill_id in ids], dtype=float
+        )
+        row_loss_factors = bill_loss_factors[bill_codes]
+    else:
+        row_loss_factors = loss_factors
+    codes = demand_price_unit_array(
+        usages, prices, subtotals, loss_factor=row_loss_factors
+    )
+
+    # Bills are contiguous in the sorted rows, each with at least one row
+    n_rows = np.bincount(bill_codes, minlength=len(ids))
+    starts = np.concatenate(([0], np.cumsum(n_rows)[:-1]))
+    n_nonsummer = np.bincount(bill_codes[~summer], minlength=len(ids))
+    consensus = np.minimum.reduceat(codes, starts) == np.maximum.reduceat(codes, starts)
+    bill_units = np.where(consensus, codes[starts], PRICE_PER_USAGE_CODE).astype(
+        np.int8
+    )
+
+    per_day_rows = bill_units[bill_codes] == PRICE_PER_USAGE_PER_DAY_CODE
+    # Per-day bills with a multiplier get_demand_multiplier would fail on
+    with np.errstate(invalid="ignore", over="ignore", divide="ignore"):
+        usage_prices = usages * prices
+        failing_rows = per_day_rows & (
+            (usage_prices == 0) | ~np.isfinite(subtotals / usage_prices)
+        )
+    failing_bills = set(np.unique(bill_codes[failing_rows]).tolist())
+    if failing_bills:
+        per_day_rows &= ~np.isin(bill_codes, list(failing_bills))
+    multipliers = np.zeros(len(codes), dtype=object)
+    multipliers[per_day_rows] = _demand_multiplier_array(
+        usages[per_day_rows], prices[per_day_rows], subtotals[per_day_rows]
+    )
+
+    results = {}
+    for code, bill_id in enumerate(ids):
+        if code in failing_bills:
+            if errors is not None:
+                middle = starts[code] + n_nonsummer[code]
+                errors[bill_id] = _multiplier_error(
+                    usages,
+                    prices,
+                    subtotals,
+                    [
+                        slice(starts[code], middle),
+                        slice(middle, starts[code] + n_rows[code]),
+                    ],
+                )
+            continue
+        start_date = start_dates.get(bill_id)
+        end_date = end_dates.get(bill_id)
+        if start_date and end_date:
+            monthly_demand = n_rows[code] == calculate_months_between_dates(
+                start_date, end_date
+            )
+        else:
+            monthly_demand = n_rows[code] > 0
+        result = {
+            "monthly_demand": bool(monthly_demand),
+            "price_unit": DEMAND_PRICE_UNITS[bill_units[code]],
+            "multipliers": None,
+        }
+        if bill_units[code] == PRICE_PER_USAGE_PER_DAY_CODE:
+            start = starts[code]
+            middle = start + n_nonsummer[code]
+            end = start + n_rows[code]
+            result["multipliers"] = {
+                "nonsummer": multipliers[start:middle].tolist(),
+                "summer": multipliers[middle:end].tolist(),
+            }
+        results[bill_id] = result
+
+    if hooks:
+        _emit(
+            hooks,
+            "demand_structure_batch",
+            {"n_bills": len(results), "n_rows": len(codes)},
+            perf_counter() - started,
+        )
+    return results
+
+
+def _as_object_array(values: List[Any]) -> np.ndarray:
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class DemandRecord:
+    """
+    Demand values of one bill held as NumPy columns, in place of the
+    ``nonsummer_demand``/``summer_demand`` dicts of scalars or lists.
+
+    Non-summer values come first, as in ``get_demand_structure``, so each
+    season is a view of the columns and the demand functions read them
+    without copying.
+
+    Attributes:
+    - usage (np.ndarray): float64 usage of each demand value.
+    - price (np.ndarray): float64 price of each demand value.
+    - subtotal (np.ndarray): float64 subtotal of each demand value.
+    - is_summer (np.ndarray): Whether each demand value is a summer one.
+    """
+
+    __slots__ = ("usage", "price", "subtotal", "is_summer", "_n_nonsummer")
+
+    def __init__(
+        self,
+        usage: Sequence[float],
+        price: Sequence[float],
+        subtotal: Sequence[float],
+        is_summer: Union[bool, Sequence[bool]] = False,
+    ):
+        usage = np.asarray(usage, dtype=float)
+        price = np.asarray(price, dtype=float)
+        subtotal = np.asarray(subtotal, dtype=float)
+        if not usage.shape == price.shape == subtotal.shape or usage.ndim != 1:
+            raise ValueError("usage, price and subtotal must be 1-d of the same length")
+        is_summer = np.broadcast_to(np.asarray(is_summer, dtype=bool), usage.shape)
+        if is_summer.size and np.any(is_summer[:-1] > is_summer[1:]):
+            # Only reorders, stably, when summer values come before non-summer ones
+            order = np.argsort(is_summer, kind="stable")
+            usage, price, subtotal = usage[order], price[order], subtotal[order]
+            is_summer = is_summer[order]
+        self.usage = usage
+        self.price = price
+        self.subtotal = subtotal
+        self.is_summer = is_summer
+        self._n_nonsummer = len(is_summer) - int(np.count_nonzero(is_summer))
+
+    @classmethod
+    def from_demand(
+        cls,
+        nonsummer_demand: Dict[str, Union[float, List[float]]],
+        summer_demand: Dict[str, Union[float, List[float]]],
+        drop_none_demand: bool = False,
+    ) -> "DemandRecord":
+        """
+        Builds a record from the demand dicts taken by ``get_demand_structure``,
+        with keys 'usage', 'price' and 'subtotal'.
+
+        With ``drop_none_demand``, values whose usage, price or subtotal means
+        no demand (see ``is_none_demand``) are left out before any conversion.
+        """
+        columns = {
+            key: combine_into_list(nonsummer_demand[key], summer_demand[key])
+            for key in ["usage", "price", "subtotal"]
+        }
+        n_nonsummer = len(to_list(nonsummer_demand["usage"]))
+        is_summer = np.arange(len(columns["usage"])) >= n_nonsummer
+        if drop_none_demand and len(is_summer):
+            keep = ~(
+                is_none_demand_array(columns["usage"])
+                | is_none_demand_array(columns["price"])
+                | is_none_demand_array(columns["subtotal"])
+            )
+            columns = {
+                key: _as_object_array(values)[keep] for key, values in columns.items()
+            }
+            is_summer = is_summer[keep]
+        return cls(columns["usage"], columns["price"], columns["subtotal"], is_summer)
+
+    def drop_none_demand(self) -> "DemandRecord":
+        """
+        Returns the record without the values whose usage, price or subtotal is
+        NaN, 0 or 999, or itself when there are none.
+        """
+        none_demand = (
+            is_none_demand_array(self.usage)
+            | is_none_demand_array(self.price)
+            | is_none_demand_array(self.subtotal)
+        )
+        if not none_demand.any():
+            return self
+        keep = ~none_demand
+        return DemandRecord(
+            self.usage[keep],
+            self.price[keep],
+            self.subtotal[keep],
+            self.is_summer[keep],
+        )
+
+    def __len__(self) -> int:
+        return len(self.usage)
+
+    def __repr__(self) -> str:
+        return (
+            f"DemandRecord(n_nonsummer={self._n_nonsummer}, "
+            f"n_summer={len(self) - self._n_nonsummer})"
+        )
+
+    def season(self, summer: bool) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Views of the usage, price and subtotal of the summer or non-summer values."""
+        rows = slice(self._n_nonsummer, None) if summer else slice(0, self._n_nonsummer)
+        return self.usage[rows], self.price[rows], self.subtotal[rows]
+
+    def to_demand(self) -> Tuple[Dict[str, List[float]], Dict[str, List[float]]]:
+        """Returns the ``nonsummer_demand`` and ``summer_demand`` dicts of lists."""
+        keys = ["usage", "price", "subtotal"]
+        return tuple(
+            dict(zip(keys, (column.tolist() for column in self.season(summer))))
+            for summer in (False, True)
+        )
+
+
+def get_demand_record_structure(
+    record: DemandRecord,
+    start_date: date,
+    end_date: date,
+    loss_factor: float = 1.0,
+) -> DemandStructureResponse:
+    """
+    ``get_demand_structure`` of a bill whose demand values are held in a ``DemandRecord``,
+    computed on its columns with array operations.
+
+    Parameters:
+    - record (DemandRecord): Summer and non-summer demand values of the bill.
+    - start_date (date): Start date of the billing period.
+    - end_date (date): End date of the billing period.
+    - loss_factor (float, optional): Factor to account for any losses in calculation.
+
+    Returns:
+    - dict: Dictionary with details about demand validation, price unit, and multipliers.
+    """
+    codes = demand_price_unit_array(
+        record.usage, record.price, record.subtotal, loss_factor=loss_factor
+    )
+    price_unit_code = PRICE_PER_USAGE_CODE
+    if len(codes) and codes.min() == codes.max():
+        price_unit_code = codes[0]
+
+    if start_date and end_date:
+        n_months = calculate_months_between_dates(start_date, end_date)
+        monthly_demand = len(record) == n_months
+    else:
+        monthly_demand = len(record) > 0
+
+    multipliers = None
+    if price_unit_code == PRICE_PER_USAGE_PER_DAY_CODE:
+        multipliers = {
+            demand_name: _demand_multiplier_array(*record.season(summer)).tolist()
+            for demand_name, summer in [("nonsummer", False), ("summer", True)]
+        }
+    return {
+        "monthly_demand": monthly_demand,
+        "price_unit": DEMAND_PRICE_UNITS[price_unit_code],
+        "multipliers": multipliers,
+    }
+
+
+class DemandStructureAccumulator:
+    """
+    Keeps the demand structure of a bill up to date as its demand values arrive
+    one at a time, e.g. one month at a time for large sites.
+
+    Each ``add`` costs O(1): it classifies the price unit and computes the
+    multiplier of the new value only, and keeps a count per price unit for the
+    consensus. ``result`` returns what ``get_demand_structure`` returns on all
+    values added so far, non-summer values before summer ones.
+
+    Parameters:
+    - start_date (date, optional): Start date of the billing period.
+    - end_date (date, optional): End date of the billing period, see ``set_period``.
+    - loss_factor (float, optional): Factor to account for any losses in calculation.
+    """
+
+    def __init__(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        loss_factor: float = 1.0,
+    ):
+        self.loss_factor = loss_factor
+        self._unit_counts = dict.fromkeys(DEMAND_PRICE_UNITS, 0)
+        self._multipliers = {"nonsummer": [], "summer": []}
+        # First error each season would raise computing its multipliers
+        self._errors: Dict[str, Optional[Exception]] = {
+            "nonsummer": None,
+            "summer": None,
+        }
+        self._n_values = 0
+        self.set_period(start_date, end_date)
+
+    def set_period(self, start_date: Optional[date], end_date: Optional[date]) -> None:
+        """Sets the billing period, e.g. extending its end as months are added."""
+        self.start_date = start_date
+        self.end_date = end_date
+        self._n_months = (
+            calculate_months_between_dates(start_date, end_date)
+            if start_date and end_date
+            else None
+        )
+
+    def add(
+        self, usage: float, price: float, subtotal: float, is_summer: bool = False
+    ) -> None:
+        """Adds one demand value of the bill."""
+        price_unit = demand_price_unit(
+            usage, price, subtotal, loss_factor=self.loss_factor
+        )
+        self._unit_counts[price_unit] += 1
+        self._n_values += 1
+
+        demand_name = "summer" if is_summer else "nonsummer"
+        try:
+            multiplier = get_demand_multiplier([usage], [price], [subtotal])[0]
+        except (ZeroDivisionError, ValueError, OverflowError) as error:
+            multiplier = None
+            if self._errors[demand_name] is None:
+                self._errors[demand_name] = error
+        self._multipliers[demand_name].append(multiplier)
+
+    def extend(self, rows: Iterable[Tuple[float, float, float, bool]]) -> None:
+        """Adds (usage, price, subtotal, is_summer) demand values."""
+        for row in rows:
+            self.add(*row)
+
+    def __len__(self) -> int:
+        return self._n_values
+
+    @property
+    def price_unit(self) -> str:
+        """The price unit shared by all values, price/usage when they differ."""
+        units = [unit for unit, count in self._unit_counts.items() if count]
+        if len(units) == 1:
+            return units[0]
+        return DemandPriceUnitEnum.price_per_usage
+
+    @property
+    def monthly_demand(self) -> bool:
+        if self._n_months is None:
+            return self._n_values > 0
+        return self._n_values == self._n_months
+
+    def result(self) -> DemandStructureResponse:
+        """
+        The demand structure of the values added so far, raising like
+        ``get_demand_structure`` when a multiplier cannot be computed.
+        """
+        price_unit = self.price_unit
+        multipliers = None
+        if price_unit == DemandPriceUnitEnum.price_per_usage_per_day:
+            for demand_name in ["nonsummer", "summer"]:
+                error = self._errors[demand_name]
+                if error is not None:
+                    raise type(error)(*error.args)
+            multipliers = {
+                demand_name: list(values)
+                for demand_name, values in self._multipliers.items()
+            }
+        return {
+            "monthly_demand": self.monthly_demand,
+            "price_unit": price_unit,
+            "multipliers": multipliers,
+        }
+
+
 def classify_demand_period(start_date: date, end_date: date):
     """
     Determines if a given date range falls within the summer months in Australia for demand classification.
     """
     # Define the months that constitute summer in Australia
-    summer_months = [12, 1, 2, 3]  # December, January, February, March
+    summer_months = SUMMER_MONTHS
 
     # Check for invalid date order
     if start_date > end_date:
@@ -214,3 +917,131 @@ def classify_demand_period(start_date: date, end_date: date):
         elif start_date.year == end_date.year:
             return SUMMER_DEMAND
     return NONSUMMER_DEMAND
+
+
+class BillingPeriodSegment(NamedTuple):
+    """The part of a billing period falling in one calendar month."""
+
+    start_date: date
+    end_date: date
+    days: int
+    season: str
+
+
+def _season(month: int) -> str:
+    return SUMMER_DEMAND if month in SUMMER_MONTHS else NONSUMMER_DEMAND
+
+
+def split_billing_period(
+    start_date: date, end_date: date
+) -> List[BillingPeriodSegment]:
+    """
+    Splits a billing period into calendar-month segments, labelling each
+    SUMMER_DEMAND or NONSUMMER_DEMAND by its month.
+
+    Parameters:
+    - start_date (date): Start date of the billing period.
+    - end_date (date): End date of the billing period, included.
+
+    Returns:
+    - List[BillingPeriodSegment]: One segment per month, as many as ``calculate_months_between_dates``
+      counts, with its inclusive number of days.
+    """
+    if start_date > end_date:
+        raise ValueError("Start date must be before or on the same day as end date.")
+
+    segments = []
+    segment_start = start_date
+    while True:
+        if segment_start.month == 12:
+            next_month = date(segment_start.year + 1, 1, 1)
+        else:
+            next_month = date(segment_start.year, segment_start.month + 1, 1)
+        segment_end = min(end_date, next_month - timedelta(days=1))
+        segments.append(
+            BillingPeriodSegment(
+                segment_start,
+                segment_end,
+                days_between_dates_inclusive(segment_start, segment_end),
+                _season(segment_start.month),
+            )
+        )
+        if segment_end == end_date:
+            return segments
+        segment_start = next_month
+
+
+class BillingPeriodSegments(NamedTuple):
+    """
+    Columns of the calendar-month segments of many billing periods, ordered by
+    period and date.
+
+    Attributes:
+    - period (np.ndarray): The position of the period of each segment in the input.
+    - start_date (np.ndarray): ``datetime64[D]`` start date of each segment.
+    - end_date (np.ndarray): ``datetime64[D]`` end date of each segment, included.
+    - days (np.ndarray): Inclusive number of days of each segment.
+    - is_summer (np.ndarray): Whether each segment falls in ``SUMMER_MONTHS``.
+    """
+
+    period: np.ndarray
+    start_date: np.ndarray
+    end_date: np.ndarray
+    days: np.ndarray
+    is_summer: np.ndarray
+
+    @property
+    def season(self) -> np.ndarray:
+        """SUMMER_DEMAND or NONSUMMER_DEMAND label of each segment."""
+        return np.where(self.is_summer, SUMMER_DEMAND, NONSUMMER_DEMAND).astype(object)
+
+
+def split_billing_periods(
+    start_dates: DateArray, end_dates: DateArray
+) -> BillingPeriodSegments:
+    """
+    Batch ``split_billing_period`` over columns of billing periods. Month boundaries
+    and seasons are looked up in a calendar table of the months the periods span,
+    built once per call. Periods with a missing date (NaT) have no segment.
+
+    Parameters:
+    - start_dates (DateArray): Start dates of the billing periods.
+    - end_dates (DateArray): End dates of the billing periods.
+
+    Returns:
+    - BillingPeriodSegments: The segments of all periods.
+    """
+    start_dates = to_datetime64_days(start_dates)
+    end_dates = to_datetime64_days(end_dates)
+    if np.any(start_dates > end_dates):
+        raise ValueError("Start date must be before or on the same day as end date.")
+
+    n_segments = calculate_months_between_dates_array(start_dates, end_dates)
+    total = int(n_segments.sum())
+    period = np.repeat(np.arange(len(n_segments)), n_segments)
+    first_segments = np.cumsum(n_segments) - n_segments
+    offsets = np.arange(total) - np.repeat(first_segments, n_segments)
+    first_months = start_dates.astype("datetime64[M]").astype(np.int64)
+    months = np.repeat(first_months, n_segments) + offsets
+
+    if total:
+        first_month, last_month = months.min(), months.max()
+    else:
+        first_month = last_month = 0
+    # Calendar table: the first day of each month spanned, and of the next one
+    calendar_months = np.arange(first_month, last_month + 2)
+    month_starts = calendar_months.astype("datetime64[M]").astype("datetime64[D]")
+    summer_months = np.isin(calendar_months % 12 + 1, SUMMER_MONTHS)
+
+    rows = months - first_month
+    segment_starts = np.maximum(start_dates[period], month_starts[rows])
+    segment_ends = np.minimum(
+        end_dates[period], month_starts[rows + 1] - np.timedelta64(1, "D")
+    )
+    return BillingPeriodSegments(
+        period,
+        segment_starts,
+        segment_ends,
+        (segment_ends - segment_starts).astype(np.int64) + 1,
+        summer_months[rows],
+    )
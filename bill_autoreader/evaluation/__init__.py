@@ -3,7 +3,9 @@ from bill_autoreader.evaluation.utils import (
     is_name_match,
     is_within_levenshtein_distance,
 )
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
+from typing import Any, List, Optional, Sequence
 from bill_autoreader.utils import convert_to_boolean, normalize_list, to_list
 
 
@@ -27,6 +29,84 @@ def validate_and_standardize_labels(labels):
     return [standardize_string(label) for label in labels]
 
 
+def _has_perfect_matching(allowed: np.ndarray) -> bool:
+    """
+    Whether each row can be assigned its own allowed column, found with
+    augmenting paths (Kuhn's algorithm). Paths are searched with an explicit
+    stack, so their length is not bounded by the recursion limit.
+    """
+    candidates = [np.flatnonzero(row).tolist() for row in allowed]
+    if not all(candidates):
+        return False
+    column_owners = {}
+
+    def assign(root):
+        visited = set()
+        # Frames of [row, remaining candidate columns, column tried for the row]
+        stack = [[root, iter(candidates[root]), None]]
+        while stack:
+            frame = stack[-1]
+            column = next((c for c in frame[1] if c not in visited), None)
+            if column is None:
+                stack.pop()
+                continue
+            visited.add(column)
+            frame[2] = column
+            owner = column_owners.get(column)
+            if owner is None:
+                # Shift every column of the path to the row that reached it
+                for row, _, row_column in stack:
+                    column_owners[row_column] = row
+                return True
+            stack.append([owner, iter(candidates[owner]), None])
+        return False
+
+    return all(assign(row) for row in range(len(candidates)))
+
+
+def _numeric_prices(prices) -> Optional[np.ndarray]:
+    """The prices as a float array when they are all numbers, else None."""
+    try:
+        values = np.asarray(prices)
+    except ValueError:
+        # Ragged sequences of prices
+        return None
+    if values.ndim != 1 or values.dtype.kind not in "biuf":
+        return None
+    return values.astype(float)
+
+
+def _same_price_mask(predicted_prices, actual_prices) -> np.ndarray:
+    """
+    Whether each predicted price equals each actual price, compared natively
+    for numeric prices and with Python equality for other or mixed prices.
+    """
+    predicted = _numeric_prices(predicted_prices)
+    actual = _numeric_prices(actual_prices)
+    if predicted is not None and actual is not None:
+        return np.equal.outer(predicted, actual)
+    return np.array(
+        [
+            [bool(predicted_price == actual_price) for actual_price in actual_prices]
+            for predicted_price in predicted_prices
+        ],
+        dtype=bool,
+    ).reshape(len(predicted_prices), len(actual_prices))
+
+
+def _match_standardized_tariffs(
+    predicted_labels, predicted_prices, actual_labels, actual_prices, threshold
+):
+    if not predicted_labels:
+        return True
+    # Similarity of every predicted and actual label, computed natively
+    scores = process.cdist(
+        predicted_labels, actual_labels, scorer=fuzz.ratio, dtype=np.float64
+    )
+    same_price = _same_price_mask(predicted_prices, actual_prices)
+    return _has_perfect_matching((scores >= threshold) & same_price)
+
+
 def match_additional_tariff(
     predicted_labels, predicted_prices, actual_labels, actual_prices, threshold=80
 ):
@@ -48,24 +128,65 @@ def match_additional_tariff(
     normalized_predicted_labels = validate_and_standardize_labels(predicted_labels)
     normalized_actual_labels = validate_and_standardize_labels(actual_labels)
 
-    # Create pairs of standardized labels and prices
-    predicted_pairs = list(zip(normalized_predicted_labels, predicted_prices))
-    actual_pairs = list(zip(normalized_actual_labels, actual_prices))
-
-    # Match each predicted pair to an actual pair
-    for predicted_label, predicted_price in predicted_pairs:
-        match_found = False
-        for actual_label, actual_price in actual_pairs:
-            label_and_value_match = (
-                fuzz.ratio(predicted_label, actual_label) >= threshold
-                and predicted_price == actual_price
+    # Each predicted pair must match its own actual pair: a label similar
+    # enough and the same price
+    return _match_standardized_tariffs(
+        normalized_predicted_labels,
+        predicted_prices,
+        normalized_actual_labels,
+        actual_prices,
+        threshold,
+    )
+
+
+def match_additional_tariff_batch(
+    predicted_labels: Sequence[Any],
+    predicted_prices: Sequence[Any],
+    actual_labels: Sequence[Any],
+    actual_prices: Sequence[Any],
+    threshold: float = 80,
+) -> List[bool]:
+    """
+    ``match_additional_tariff`` of many bills, given one list of labels and
+    one list of prices per bill. Labels repeated across bills are standardized
+    once.
+    """
+    standardized = {}
+
+    def standardize(label):
+        if not isinstance(label, str):
+            return standardize_string(label)
+        value = standardized.get(label)
+        if value is None:
+            value = standardized[label] = standardize_string(label)
+        return value
+
+    results = []
+    for bill in zip(predicted_labels, predicted_prices, actual_labels, actual_prices):
+        (
+            bill_predicted_labels,
+            bill_predicted_prices,
+            bill_actual_labels,
+            bill_actual_prices,
+        ) = map(to_list, bill)
+        if not (
+            len(bill_predicted_labels)
+            == len(bill_predicted_prices)
+            == len(bill_actual_labels)
+            == len(bill_actual_prices)
+        ):
+            results.append(False)
+            continue
+        results.append(
+            _match_standardized_tariffs(
+                [standardize(label) for label in bill_predicted_labels],
+                bill_predicted_prices,
+                [standardize(label) for label in bill_actual_labels],
+                bill_actual_prices,
+                threshold,
             )
-            if label_and_value_match:
-                match_found = True
-                break
-        if not match_found:
-            return False
-    return True
+        )
+    return results
 
 
 def match_monthly_demand_multiplier(predicted_value, actual_value):
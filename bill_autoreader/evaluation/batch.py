@@ -0,0 +1,144 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from bill_autoreader.constants import ADDITIONAL_LABEL, ADDITIONAL_PRICE
+from bill_autoreader.evaluation import variable_to_evaluation_func
+
+Record = Dict[str, Any]
+
+# Record keys passed to a matcher, for the fields not stored under their own name.
+FIELD_KEYS = {
+    "additional_tariff": (ADDITIONAL_LABEL, ADDITIONAL_PRICE),
+}
+
+
+class FieldAccuracy(NamedTuple):
+    """
+    Attributes:
+    - evaluated (int): Number of records whose actual record has the field.
+    - matched (int): Number of those whose prediction matches.
+    - errors (int): Number of those whose matcher raised, counted as not matched.
+    - accuracy (Optional[float]): matched / evaluated, None when nothing was evaluated.
+    """
+
+    evaluated: int
+    matched: int
+    errors: int
+    accuracy: Optional[float]
+
+
+def _field_keys(field: str) -> Tuple[str, ...]:
+    return FIELD_KEYS.get(field, (field,))
+
+
+def _check_fields(fields: Optional[Sequence[str]]) -> List[str]:
+    if fields is None:
+        return list(variable_to_evaluation_func)
+    unknown = [field for field in fields if field not in variable_to_evaluation_func]
+    if unknown:
+        raise KeyError(f"No evaluation function for fields: {unknown}")
+    return list(fields)
+
+
+def match_record(predicted: Record, actual: Record, field: str) -> Optional[bool]:
+    """
+    Runs the matcher of a field on a predicted and an actual record, returning
+    None when the actual record does not have the field.
+    """
+    keys = _field_keys(field)
+    if keys[0] not in actual:
+        return None
+    return bool(
+        variable_to_evaluation_func[field](
+            *(predicted.get(key) for key in keys), *(actual.get(key) for key in keys)
+        )
+    )
+
+
+def _count_chunk(
+    pairs: List[Tuple[Record, Record]], fields: List[str]
+) -> Dict[str, List[int]]:
+    counts = {field: [0, 0, 0] for field in fields}
+    for predicted, actual in pairs:
+        for field in fields:
+            field_counts = counts[field]
+            try:
+                matched = match_record(predicted, actual, field)
+            except Exception:
+                field_counts[0] += 1
+                field_counts[2] += 1
+                continue
+            if matched is not None:
+                field_counts[0] += 1
+                field_counts[1] += matched
+    return counts
+
+
+def _count_chunk_star(args: Tuple[List[Tuple[Record, Record]], List[str]]):
+    return _count_chunk(*args)
+
+
+def evaluate_records(
+    predicted: Sequence[Record],
+    actual: Sequence[Record],
+    fields: Optional[Sequence[str]] = None,
+    max_workers: Optional[int] = 1,
+    chunk_size: int = 1_000,
+) -> Dict[str, FieldAccuracy]:
+    """
+    Scores predicted records against actual records with the matchers of
+    ``variable_to_evaluation_func``, optionally across a process pool.
+
+    Records are dicts keyed by field name; the additional tariffs are read
+    from the ``ADDITIONAL_LABEL`` and ``ADDITIONAL_PRICE`` keys. A field is
+    evaluated on the records whose actual record has it. Counts are merged
+    in record order, so the result does not depend on the number of workers.
+
+    Parameters
+    ----------
+    predicted : Sequence[Record]
+        Predicted records.
+    actual : Sequence[Record]
+        Actual records, in the same order as the predicted ones.
+    fields : Sequence[str], optional
+        Fields to evaluate, defaults to all of ``variable_to_evaluation_func``.
+    max_workers : int, optional
+        Number of worker processes; 1 evaluates in this process and None
+        uses one process per CPU.
+    chunk_size : int, optional
+        Number of record pairs sent to a worker per task.
+
+    Returns
+    -------
+    Dict[str, FieldAccuracy]
+        The counts and accuracy of each field, in the order of ``fields``.
+    """
+    if len(predicted) != len(actual):
+        raise ValueError("predicted and actual must have the same number of records.")
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    fields = _check_fields(fields)
+
+    pairs = list(zip(predicted, actual))
+    chunks = [
+        (pairs[i : i + chunk_size], fields) for i in range(0, len(pairs), chunk_size)
+    ]
+    if max_workers == 1 or len(chunks) <= 1:
+        return _aggregate(map(_count_chunk_star, chunks), fields)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return _aggregate(executor.map(_count_chunk_star, chunks), fields)
+
+
+def _aggregate(chunk_counts, fields: List[str]) -> Dict[str, FieldAccuracy]:
+    totals = {field: [0, 0, 0] for field in fields}
+    for counts in chunk_counts:
+        for field, (evaluated, matched, errors) in counts.items():
+            total = totals[field]
+            total[0] += evaluated
+            total[1] += matched
+            total[2] += errors
+    return {
+        field: FieldAccuracy(
+            evaluated, matched, errors, matched / evaluated if evaluated else None
+        )
+        for field, (evaluated, matched, errors) in totals.items()
+    }
@@ -0,0 +1,140 @@
+import csv
+import json
+import os
+from itertools import groupby
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+from bill_autoreader.std import get_classifier
+
+LINE_ITEM_FIELDS = ["bill_id", "label", "usage", "price", "subtotal"]
+NUMERIC_FIELDS = ["usage", "price", "subtotal"]
+REQUIRED_FIELDS = ["bill_id", "label"]
+
+_FILE_FORMATS = {".jsonl": "jsonl", ".ndjson": "jsonl", ".csv": "csv"}
+
+
+def _to_number(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    return float(value)
+
+
+def _read_jsonl(file, path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    for line_number, line in enumerate(file, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as error:
+            raise ValueError(
+                f"Line {line_number} of {path} is not valid JSON: {error}"
+            ) from error
+        if not isinstance(row, dict):
+            raise ValueError(f"Line {line_number} of {path} is not a JSON object")
+        yield line_number, row
+
+
+def _read_csv(file, path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    reader = csv.DictReader(file)
+    if reader.fieldnames is not None:
+        missing = [field for field in REQUIRED_FIELDS if field not in reader.fieldnames]
+        if missing:
+            raise ValueError(f"Line 1 of {path} has no {', '.join(missing)} column")
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_line_items(
+    path: str, file_format: Optional[str] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily reads line items from a JSONL or CSV file, one row at a time.
+
+    Parameters:
+    - path (str): Path of the file to read, a leading UTF-8 BOM being ignored.
+    - file_format (str, optional): "jsonl" or "csv", detected from the file extension by default.
+
+    Returns:
+    - Iterator[Dict[str, Any]]: Line items with bill_id, label, usage, price and subtotal,
+      the numeric fields converted to float (None when blank).
+
+    Raises:
+    - ValueError: If the CSV header lacks the bill_id or label column, or if a
+      line item is not a JSON object, has no bill_id, has no string label or has
+      a numeric field that is not a number, with the line number in the file.
+    """
+    if file_format is None:
+        extension = os.path.splitext(path)[1].lower()
+        try:
+            file_format = _FILE_FORMATS[extension]
+        except KeyError:
+            raise ValueError(f"Cannot detect the line item format of {path}")
+    if file_format not in ("jsonl", "csv"):
+        raise ValueError(f"Unsupported line item format: {file_format}")
+
+    # utf-8-sig drops the byte order mark of spreadsheet exports
+    with open(path, newline="", encoding="utf-8-sig") as file:
+        rows = (
+            _read_csv(file, path) if file_format == "csv" else _read_jsonl(file, path)
+        )
+        for line_number, row in rows:
+            line_item = {field: row.get(field) for field in LINE_ITEM_FIELDS}
+            if line_item["bill_id"] is None or line_item["bill_id"] == "":
+                raise ValueError(f"Line {line_number} of {path} has no bill_id")
+            if not isinstance(line_item["label"], str):
+                raise ValueError(
+                    f"Line {line_number} of {path} has no string label: "
+                    f"{line_item['label']!r}"
+                )
+            for field in NUMERIC_FIELDS:
+                try:
+                    line_item[field] = _to_number(line_item[field])
+                except (TypeError, ValueError):
+                    raise ValueError(
+                        f"Line {line_number} of {path} has a non-numeric {field}: "
+                        f"{line_item[field]!r}"
+                    ) from None
+            yield line_item
+
+
+def standardize_bills(
+    line_items: Iterable[Dict[str, Any]], tariff_group: str = "energy_consumption"
+) -> Iterator[Dict[str, Any]]:
+    """
+    Groups line items by bill and standardizes their labels, one bill at a time.
+
+    Line items of a bill must be contiguous in the input, as in exports sorted
+    by bill; only the line items of the current bill are held in memory.
+
+    Parameters:
+    - line_items (Iterable[Dict[str, Any]]): Line items with at least bill_id and label.
+    - tariff_group (str, optional): The standard tariff group to use for standardization.
+
+    Returns:
+    - Iterator[Dict[str, Any]]: One result per bill with its bill_id, its line items each
+      extended with std_tariff, and the label mapping returned by map_to_standardize_tariffs.
+    """
+    classifier = get_classifier(tariff_group)
+    for bill_id, rows in groupby(line_items, key=itemgetter("bill_id")):
+        rows = list(rows)
+        tariffs = classifier.classify_many(row["label"] for row in rows)
+        yield {
+            "bill_id": bill_id,
+            "line_items": [
+                {**row, "std_tariff": tariffs[row["label"]]} for row in rows
+            ],
+            "tariffs": tariffs,
+        }
+
+
+def stream_standardized_bills(
+    path: str,
+    tariff_group: str = "energy_consumption",
+    file_format: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Reads line items from a JSONL or CSV file of any size and yields
+    standardized bills with constant memory use. See ``read_line_items`` and
+    ``standardize_bills``.
+    """
+    return standardize_bills(read_line_items(path, file_format), tariff_group)
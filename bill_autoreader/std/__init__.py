@@ -1,30 +1,56 @@
-import re, warnings
 from typing import List, Dict
-from bill_autoreader.constants import TYPE_TARIFFS
-from bill_autoreader.std.patterns import TariffPatterns
-from bill_autoreader.utils import normalize_string
+from bill_autoreader.std.patterns import TariffPatterns, get_regex_patterns
+from bill_autoreader.std.cache import LabelCache, LabelCacheInfo
+from bill_autoreader.std.classifier import (
+    TariffClassifier,
+    compile_patterns,
+    compile_prefiltered_patterns,
+    matches_any,
+    get_classifier,
+    refresh_classifiers,
+    enable_label_cache,
+    disable_label_cache,
+    label_cache_info,
+    enable_pattern_profiler,
+    disable_pattern_profiler,
+)
+from bill_autoreader.std.instrumentation import PatternProfiler
+from bill_autoreader.std.bulk import map_to_standardize_tariffs_bulk
+from bill_autoreader.utils import NormalizedLabel
 
-
-def get_regex_patterns(field: str) -> List[str]:
-    """Get all regex patterns to find tariffs."""
-    try:
-        return getattr(TariffPatterns, field.upper())
-    except AttributeError:
-        raise Exception(f"Invalid field name: {field}")
+__all__ = [
+    "TariffPatterns",
+    "get_regex_patterns",
+    "LabelCache",
+    "LabelCacheInfo",
+    "TariffClassifier",
+    "compile_patterns",
+    "compile_prefiltered_patterns",
+    "matches_any",
+    "get_classifier",
+    "refresh_classifiers",
+    "enable_label_cache",
+    "disable_label_cache",
+    "label_cache_info",
+    "enable_pattern_profiler",
+    "disable_pattern_profiler",
+    "PatternProfiler",
+    "map_to_standardize_tariffs_bulk",
+    "identify_tariffs",
+    "map_to_standardize_tariffs",
+    "map_to_standardize_tariffs_batch",
+]
 
 
 def identify_tariffs(ori_tariff_names: List[str], std_tariff: str) -> list[str]:
     """
     Identifies tariff where the tariff names matches a specified standard tariff.
     """
-    pattern_list = get_regex_patterns(std_tariff)
+    pattern_list = compile_prefiltered_patterns(std_tariff)
     found_tariffs = [
         tariff
         for tariff in ori_tariff_names
-        if any(
-            re.search(pattern, normalize_string(tariff), re.IGNORECASE)
-            for pattern in pattern_list
-        )
+        if matches_any(pattern_list, NormalizedLabel(tariff))
     ]
     return list(set(found_tariffs))
 
@@ -46,24 +72,33 @@ def map_to_standardize_tariffs(
     -------
     Dict[str, str]
         A mapping of each original tariff to its standardized equivalent.
+
+    Safe to call from several threads: the shared classifier of the group is
+    created once and classification does not touch process-global state.
     """
-    warnings.filterwarnings("ignore")
-    all_std_tariffs: list[str] = TYPE_TARIFFS[tariff_group]
-    tariff_mapping = {}
-    remaining_tariffs = list(tariffs)
+    return get_classifier(tariff_group).classify_many(tariffs)
 
-    for standard_tariff in all_std_tariffs:
-        matched_tariffs = identify_tariffs(remaining_tariffs, standard_tariff)
-        for tariff in matched_tariffs:
-            tariff_mapping[tariff] = standard_tariff
 
-        # Remove all occurrences of matched tariffs
-        remaining_tariffs = [
-            tariff for tariff in remaining_tariffs if tariff not in matched_tariffs
-        ]
+def map_to_standardize_tariffs_batch(
+    bills: List[List[str]], tariff_group: str = "energy_consumption"
+) -> List[Dict[str, str]]:
+    """
+    Standardizes the tariff names of many bills, classifying each distinct
+    tariff name only once across the whole batch.
 
-    # Mark remaining unmatched tariffs as None
-    for tariff in remaining_tariffs:
-        tariff_mapping[tariff] = None
+    Parameters
+    ----------
+    bills : List[List[str]]
+        The original tariff names of each bill.
+    tariff_group : str, optional
+        The standard tariff group to use for standardization.
 
-    return tariff_mapping
+    Returns
+    -------
+    List[Dict[str, str]]
+        One mapping per bill, as returned by ``map_to_standardize_tariffs``.
+    """
+    std_tariffs = get_classifier(tariff_group).classify_many(
+        tariff for tariffs in bills for tariff in tariffs
+    )
+    return [{tariff: std_tariffs[tariff] for tariff in tariffs} for tariffs in bills]
@@ -0,0 +1,69 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+from bill_autoreader.constants import TYPE_TARIFFS
+from bill_autoreader.std.classifier import TariffClassifier
+
+# Classifier of the current worker process, compiled once by the initializer.
+_WORKER_CLASSIFIER: Optional[TariffClassifier] = None
+
+
+def _init_worker(tariff_group: str) -> None:
+    global _WORKER_CLASSIFIER
+    _WORKER_CLASSIFIER = TariffClassifier(tariff_group)
+
+
+def _classify_chunk(tariffs: List[str]) -> List[Optional[str]]:
+    return [_WORKER_CLASSIFIER.classify(tariff) for tariff in tariffs]
+
+
+def map_to_standardize_tariffs_bulk(
+    tariffs: Iterable[str],
+    tariff_group: str = "energy_consumption",
+    max_workers: Optional[int] = None,
+    chunk_size: int = 10_000,
+) -> Dict[str, Optional[str]]:
+    """
+    Standardizes a large collection of tariff names across a process pool.
+
+    Distinct tariff names are split into chunks that are classified by worker
+    processes, each compiling the patterns once when it starts. Results are
+    merged in the order the tariff names were first seen, whatever the order
+    in which workers finish.
+
+    Parameters
+    ----------
+    tariffs : Iterable[str]
+        Original tariff names, duplicates allowed.
+    tariff_group : str, optional
+        The standard tariff group to use for standardization.
+    max_workers : int, optional
+        Number of worker processes, defaults to the number of CPUs.
+    chunk_size : int, optional
+        Number of distinct tariff names sent to a worker per task.
+
+    Returns
+    -------
+    Dict[str, Optional[str]]
+        A mapping of each original tariff to its standardized equivalent.
+    """
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be a positive integer.")
+    TYPE_TARIFFS[tariff_group]  # fail fast on unknown groups, before forking
+
+    unique_tariffs = list(dict.fromkeys(tariffs))
+    chunks = [
+        unique_tariffs[i : i + chunk_size]
+        for i in range(0, len(unique_tariffs), chunk_size)
+    ]
+    tariff_mapping = {}
+    if not chunks:
+        return tariff_mapping
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(tariff_group,),
+    ) as executor:
+        for chunk, std_tariffs in zip(chunks, executor.map(_classify_chunk, chunks)):
+            tariff_mapping.update(zip(chunk, std_tariffs))
+    return tariff_mapping
@@ -0,0 +1,90 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, NamedTuple, Optional, Tuple
+
+
+class LabelCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+    hit_rate: float
+
+
+class LabelCache:
+    """
+    Size-bounded LRU cache of tariff name classifications.
+
+    Entries are keyed by ``(tariff_group, tariff_name)``. Each tariff group is
+    bound to the fingerprint of the patterns its results were computed with,
+    and the entries of a group are dropped when that fingerprint changes.
+
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of cached tariff names, across all tariff groups.
+    """
+
+    def __init__(self, maxsize: int = 100_000):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be a positive integer.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Tuple[str, str], Optional[str]]" = OrderedDict()
+        self._fingerprints: Dict[str, Hashable] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[str, str], default: Any = None) -> Any:
+        """Returns the cached classification of a key, marking it recently used."""
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Tuple[str, str], value: Optional[str]) -> None:
+        """Stores a classification, evicting the least recently used entries."""
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bind(self, tariff_group: str, fingerprint: Hashable) -> None:
+        """Binds a tariff group to its pattern fingerprint, invalidating stale entries."""
+        with self._lock:
+            if self._fingerprints.get(tariff_group, fingerprint) != fingerprint:
+                for key in [key for key in self._entries if key[0] == tariff_group]:
+                    del self._entries[key]
+            self._fingerprints[tariff_group] = fingerprint
+
+    def clear(self) -> None:
+        """Drops all entries and resets the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._fingerprints.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def info(self) -> LabelCacheInfo:
+        """Returns hit, miss, eviction and size statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return LabelCacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                hit_rate=self.hits / lookups if lookups else 0.0,
+            )
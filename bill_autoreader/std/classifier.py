@@ -0,0 +1,432 @@
+import re
+import threading
+import weakref
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+from bill_autoreader.constants import TYPE_TARIFFS
+from bill_autoreader.std.cache import LabelCache, LabelCacheInfo
+from bill_autoreader.std.instrumentation import PatternProfiler
+from bill_autoreader.std.patterns import get_regex_patterns
+from bill_autoreader.std.prefilter import longest_required_literal
+from bill_autoreader.std.rules import TokenRule, compile_token_rule
+from bill_autoreader.std.retailer import RETAILERS_TARIFFS
+from bill_autoreader.utils import NormalizedLabel
+
+
+@lru_cache(maxsize=None)
+def _compile_pattern_list(patterns: Tuple[str, ...]) -> Tuple[Pattern, ...]:
+    return tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+
+
+# (required literal, compiled pattern, token rule replacing the pattern)
+PatternEntry = Tuple[Optional[str], Pattern, Optional[TokenRule]]
+
+
+@lru_cache(maxsize=None)
+def _prefilter_pattern_list(patterns: Tuple[str, ...]) -> Tuple[PatternEntry, ...]:
+    return tuple(
+        (longest_required_literal(pattern), compiled, compile_token_rule(pattern))
+        for pattern, compiled in zip(patterns, _compile_pattern_list(patterns))
+    )
+
+
+def compile_patterns(field: str) -> Tuple[Pattern, ...]:
+    """Compile the regex patterns of a standard tariff field once."""
+    return _compile_pattern_list(tuple(get_regex_patterns(field)))
+
+
+def compile_prefiltered_patterns(field: str) -> Tuple[PatternEntry, ...]:
+    """
+    Compile the regex patterns of a standard tariff field once, each paired
+    with a literal that must occur in the lowercased tariff name for the
+    pattern to match (None when the pattern has to be evaluated anyway) and,
+    for negative-lookahead patterns, the equivalent token rule.
+    """
+    return _prefilter_pattern_list(tuple(get_regex_patterns(field)))
+
+
+def matches_any(patterns: Tuple[PatternEntry, ...], label: NormalizedLabel) -> bool:
+    """Checks whether any prefiltered pattern matches a normalized tariff name."""
+    lowered = label.lowered
+    for literal, pattern, rule in patterns:
+        if literal is not None and literal not in lowered:
+            continue
+        if rule is None:
+            if pattern.search(label.text):
+                return True
+        elif rule.matches(label):
+            return True
+    return False
+
+
+def pattern_fingerprint(std_tariffs: List[str]) -> Tuple:
+    """Returns a hashable snapshot of the patterns registered for standard tariffs."""
+    return tuple(
+        (std_tariff, tuple(get_regex_patterns(std_tariff)))
+        for std_tariff in std_tariffs
+    )
+
+
+_MISSING = object()
+
+
+def build_label_index(
+    retailers_tariffs: List[Dict[str, str]], std_tariffs: List[str]
+) -> Dict[str, str]:
+    """
+    Builds an exact-match index of known retailer tariff names.
+
+    Keys are the ASCII-folded, lowercased tariff names, which the regex path
+    treats the same way as the original names since every pattern is
+    case-insensitive and matched against the ASCII-folded name. Tariff names
+    whose standard tariff is not part of ``std_tariffs`` are left out.
+    """
+    return {
+        NormalizedLabel(label).lowered: std_tariff
+        for tariffs in retailers_tariffs
+        for label, std_tariff in tariffs.items()
+        if std_tariff in std_tariffs
+    }
+
+
+class _IndexCounters:
+    """Exact-match index counters updated by a single thread."""
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+
+
+class _ThreadToken:
+    """Held by a thread's local storage only, so it is freed when the thread ends."""
+
+    __slots__ = ("counters", "__weakref__")
+
+    def __init__(self, counters: _IndexCounters):
+        self.counters = counters
+
+
+class _CounterRegistry:
+    """
+    Index counters of the live threads of a classifier. The counts of a thread
+    are folded into running totals and its counters dropped when it ends, so
+    short-lived threads do not accumulate.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._live: List[_IndexCounters] = []
+        self._retired_hits = 0
+        self._retired_misses = 0
+
+    def register(self, token: _ThreadToken) -> None:
+        with self._lock:
+            self._live.append(token.counters)
+        weakref.finalize(token, self._retire, token.counters)
+
+    def _retire(self, counters: _IndexCounters) -> None:
+        with self._lock:
+            self._live.remove(counters)
+            self._retired_hits += counters.hits
+            self._retired_misses += counters.misses
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._live)
+
+    def totals(self) -> Tuple[int, int]:
+        """Returns the hits and misses of all threads, live or ended."""
+        with self._lock:
+            return (
+                self._retired_hits + sum(counters.hits for counters in self._live),
+                self._retired_misses + sum(counters.misses for counters in self._live),
+            )
+
+
+class TariffClassifier:
+    """
+    Classifies original tariff names into the standard tariffs of a tariff group.
+
+    All patterns of the group are compiled when the classifier is created, so
+    classifying a tariff name never goes through the ``re`` module cache. A
+    tariff name is visited once, trying standard tariffs in group order, and
+    a pattern is only evaluated when its required literal occurs in the name.
+    Negative-lookahead patterns are evaluated as token rules on the words of
+    the name rather than by the regex engine.
+
+    Tariff names already listed in ``RETAILERS_TARIFFS`` are resolved from an
+    exact-match index before falling back to the patterns; ``index_hits`` and
+    ``index_misses`` count how often each path is taken.
+
+    Classification does not mutate shared state: compiled patterns and rules
+    are read-only after construction and the index counters are kept per
+    thread, so one classifier can serve a thread pool. An attached cache or
+    profiler serializes its own updates with a lock. Scaling on free-threaded
+    builds (CPython 3.13t) has not been measured yet, see
+    ``benchmarks.std_threads``.
+
+    An optional ``LabelCache`` memoizes classifications per tariff name; it
+    is invalidated for the group when ``refresh`` picks up changed patterns.
+    An optional ``PatternProfiler`` records per-pattern evaluations, matches
+    and timings; while it is attached, tariff names resolved by the index are
+    also run through the patterns so that they show up in its report.
+
+    Parameters
+    ----------
+    tariff_group : str, optional
+        The standard tariff group from ``TYPE_TARIFFS`` to classify into.
+    retailers_tariffs : List[Dict[str, str]], optional
+        Known retailer tariff names used for the exact-match index. Pass None
+        to always use the patterns.
+    cache : LabelCache, optional
+        Cache of previous classifications, which may be shared between groups.
+    profiler : PatternProfiler, optional
+        Instrumentation of the patterns, which slows classification down.
+    """
+
+    def __init__(
+        self,
+        tariff_group: str = "energy_consumption",
+        retailers_tariffs: Optional[List[Dict[str, str]]] = RETAILERS_TARIFFS,
+        cache: Optional[LabelCache] = None,
+        profiler: Optional[PatternProfiler] = None,
+    ):
+        self.tariff_group = tariff_group
+        self.std_tariffs: List[str] = list(TYPE_TARIFFS[tariff_group])
+        self.retailers_tariffs = retailers_tariffs
+        self._compile()
+        self.cache: Optional[LabelCache] = None
+        self.set_cache(cache)
+        self.profiler = profiler
+        self._counter_registry = _CounterRegistry()
+        self._thread_state = threading.local()
+
+    def _compile(self) -> None:
+        self.fingerprint = pattern_fingerprint(self.std_tariffs)
+        self._prefiltered_patterns = [
+            (std_tariff, compile_prefiltered_patterns(std_tariff))
+            for std_tariff in self.std_tariffs
+        ]
+        self.label_index: Optional[Dict[str, str]] = None
+        if self.retailers_tariffs is not None:
+            # The index only shortcuts the patterns: names the patterns now
+            # classify differently are left to them
+            self.label_index = {
+                lowered: std_tariff
+                for lowered, std_tariff in build_label_index(
+                    self.retailers_tariffs, self.std_tariffs
+                ).items()
+                if self._match_patterns(NormalizedLabel(lowered)) == std_tariff
+            }
+
+    def set_cache(self, cache: Optional[LabelCache]) -> None:
+        """Attaches a classification cache, or detaches it when None."""
+        if cache is not None:
+            cache.bind(self.tariff_group, self.fingerprint)
+        self.cache = cache
+
+    def refresh(self) -> bool:
+        """
+        Recompiles the patterns and rebuilds the exact-match index if
+        ``TariffPatterns`` changed since they were compiled, invalidating
+        cached classifications of the group.
+
+        Returns
+        -------
+        bool
+            True when the patterns changed.
+        """
+        if pattern_fingerprint(self.std_tariffs) == self.fingerprint:
+            return False
+        self._compile()
+        self.set_cache(self.cache)
+        return True
+
+    def _thread_counters(self) -> _IndexCounters:
+        token = getattr(self._thread_state, "token", None)
+        if token is None:
+            token = self._thread_state.token = _ThreadToken(_IndexCounters())
+            self._counter_registry.register(token)
+        return token.counters
+
+    @property
+    def index_hits(self) -> int:
+        """Number of tariff names resolved by the exact-match index."""
+        return self._counter_registry.totals()[0]
+
+    @property
+    def index_misses(self) -> int:
+        """Number of tariff names that fell back to the patterns."""
+        return self._counter_registry.totals()[1]
+
+    @property
+    def index_hit_rate(self) -> float:
+        """Share of classified tariff names resolved by the exact-match index."""
+        hits, misses = self.index_hits, self.index_misses
+        return hits / (hits + misses) if hits + misses else 0.0
+
+    def classify(self, tariff: str) -> Optional[str]:
+        """
+        Returns the first standard tariff, in group order, whose patterns match
+        the tariff name, or None when no pattern matches.
+        """
+        if self.cache is None:
+            return self._classify(tariff)
+
+        key = (self.tariff_group, tariff)
+        std_tariff = self.cache.get(key, _MISSING)
+        if std_tariff is _MISSING:
+            std_tariff = self._classify(tariff)
+            self.cache.put(key, std_tariff)
+        return std_tariff
+
+    def _classify(self, tariff: str) -> Optional[str]:
+        label = NormalizedLabel(tariff)
+        profiler = self.profiler
+        if self.label_index is not None:
+            std_tariff = self.label_index.get(label.lowered)
+            counters = self._thread_counters()
+            if std_tariff is not None:
+                counters.hits += 1
+                if profiler is not None:
+                    # Record the patterns this traffic would fire, the index
+                    # staying authoritative for the result.
+                    profiler.record_index_hit(std_tariff)
+                    self._classify_profiled(label)
+                return std_tariff
+            counters.misses += 1
+
+        if profiler is not None:
+            return self._classify_profiled(label)
+        return self._match_patterns(label)
+
+    def _match_patterns(self, label: NormalizedLabel) -> Optional[str]:
+        for std_tariff, patterns in self._prefiltered_patterns:
+            if matches_any(patterns, label):
+                return std_tariff
+        return None
+
+    def _classify_profiled(self, label: NormalizedLabel) -> Optional[str]:
+        profiler = self.profiler
+        for std_tariff, patterns in self._prefiltered_patterns:
+            for index, (literal, pattern, rule) in enumerate(patterns):
+                if literal is not None and literal not in label.lowered:
+                    profiler.record_skip(std_tariff, index, pattern.pattern)
+                    continue
+                start = perf_counter()
+                if rule is None:
+                    matched = pattern.search(label.text) is not None
+                else:
+                    matched = rule.matches(label)
+                profiler.record(
+                    std_tariff, index, pattern.pattern, matched, perf_counter() - start
+                )
+                if matched:
+                    return std_tariff
+        return None
+
+    def classify_many(self, tariffs: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Classifies every distinct tariff name of a list.
+
+        Parameters
+        ----------
+        tariffs : Iterable[str]
+            Original tariff names, duplicates allowed.
+
+        Returns
+        -------
+        Dict[str, Optional[str]]
+            A mapping of each original tariff to its standardized equivalent.
+        """
+        return {tariff: self.classify(tariff) for tariff in dict.fromkeys(tariffs)}
+
+
+_CLASSIFIERS: Dict[str, TariffClassifier] = {}
+_CLASSIFIERS_LOCK = threading.Lock()
+_LABEL_CACHE: Optional[LabelCache] = None
+_PATTERN_PROFILER: Optional[PatternProfiler] = None
+
+
+def get_classifier(tariff_group: str = "energy_consumption") -> TariffClassifier:
+    """
+    Returns the shared classifier of a tariff group, creating it on first use.
+
+    Shared classifiers are read-only once created: changes to ``TariffPatterns``
+    are picked up by calling ``refresh_classifiers``.
+    """
+    classifier = _CLASSIFIERS.get(tariff_group)
+    if classifier is None:
+        with _CLASSIFIERS_LOCK:
+            classifier = _CLASSIFIERS.get(tariff_group)
+            if classifier is None:
+                classifier = _CLASSIFIERS[tariff_group] = TariffClassifier(
+                    tariff_group, cache=_LABEL_CACHE, profiler=_PATTERN_PROFILER
+                )
+    return classifier
+
+
+def refresh_classifiers() -> List[str]:
+    """
+    Recompiles the shared classifiers whose patterns changed in ``TariffPatterns``,
+    rebuilding their exact-match index and invalidating their cached
+    classifications. Call it after editing the patterns at runtime.
+
+    Returns
+    -------
+    List[str]
+        The tariff groups whose patterns changed.
+    """
+    return [
+        tariff_group
+        for tariff_group, classifier in list(_CLASSIFIERS.items())
+        if classifier.refresh()
+    ]
+
+
+def enable_label_cache(maxsize: int = 100_000) -> LabelCache:
+    """
+    Turns on an LRU cache of classifications shared by the classifiers
+    returned from ``get_classifier``, replacing any cache enabled before.
+    """
+    global _LABEL_CACHE
+    _LABEL_CACHE = LabelCache(maxsize)
+    for classifier in _CLASSIFIERS.values():
+        classifier.set_cache(_LABEL_CACHE)
+    return _LABEL_CACHE
+
+
+def disable_label_cache() -> None:
+    """Turns off the classification cache of the shared classifiers."""
+    global _LABEL_CACHE
+    _LABEL_CACHE = None
+    for classifier in _CLASSIFIERS.values():
+        classifier.set_cache(None)
+
+
+def label_cache_info() -> Optional[LabelCacheInfo]:
+    """Returns the statistics of the shared classification cache, if enabled."""
+    return None if _LABEL_CACHE is None else _LABEL_CACHE.info()
+
+
+def enable_pattern_profiler() -> PatternProfiler:
+    """
+    Turns on per-pattern instrumentation of the classifiers returned from
+    ``get_classifier``, replacing any profiler enabled before.
+    """
+    global _PATTERN_PROFILER
+    _PATTERN_PROFILER = PatternProfiler()
+    for classifier in _CLASSIFIERS.values():
+        classifier.profiler = _PATTERN_PROFILER
+    return _PATTERN_PROFILER
+
+
+def disable_pattern_profiler() -> None:
+    """Turns off the instrumentation of the shared classifiers."""
+    global _PATTERN_PROFILER
+    _PATTERN_PROFILER = None
+    for classifier in _CLASSIFIERS.values():
+        classifier.profiler = None
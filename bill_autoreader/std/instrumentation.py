@@ -0,0 +1,104 @@
+import json
+import threading
+from typing import Dict, List, Tuple
+
+
+class PatternStats:
+    """Counters of one pattern of a standard tariff field."""
+
+    __slots__ = ("pattern", "evaluations", "matches", "skipped", "seconds")
+
+    def __init__(self, pattern: str):
+        self.pattern = pattern
+        self.evaluations = 0
+        self.matches = 0
+        self.skipped = 0
+        self.seconds = 0.0
+
+
+class PatternProfiler:
+    """
+    Records, per standard tariff field and per pattern, how often a pattern is
+    evaluated, how often it matches, how often the literal prefilter skips it
+    and the cumulative time spent evaluating it.
+
+    Patterns are identified by their field and position in ``TariffPatterns``,
+    so reports of two releases can be diffed line by line.
+
+    Tariff names resolved by the exact-match index are counted per field
+    with ``record_index_hit``; classifiers still evaluate the patterns on
+    them while profiling, so patterns firing on that traffic are recorded.
+    """
+
+    def __init__(self):
+        self._stats: Dict[Tuple[str, int], PatternStats] = {}
+        self._index_hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, field: str, index: int, pattern: str) -> PatternStats:
+        stats = self._stats.get((field, index))
+        if stats is None or stats.pattern != pattern:
+            stats = self._stats[(field, index)] = PatternStats(pattern)
+        return stats
+
+    def record_index_hit(self, field: str) -> None:
+        with self._lock:
+            self._index_hits[field] = self._index_hits.get(field, 0) + 1
+
+    def record_skip(self, field: str, index: int, pattern: str) -> None:
+        with self._lock:
+            self._get(field, index, pattern).skipped += 1
+
+    def record(
+        self, field: str, index: int, pattern: str, matched: bool, seconds: float
+    ) -> None:
+        with self._lock:
+            stats = self._get(field, index, pattern)
+            stats.evaluations += 1
+            stats.matches += matched
+            stats.seconds += seconds
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+            self._index_hits.clear()
+
+    def report(self) -> List[Dict]:
+        """
+        Returns one entry per pattern seen, ordered by field and pattern
+        position, with its counters and mean evaluation time in microseconds.
+        """
+        with self._lock:
+            items = sorted(self._stats.items())
+            return [
+                {
+                    "field": field,
+                    "index": index,
+                    "pattern": stats.pattern,
+                    "evaluations": stats.evaluations,
+                    "matches": stats.matches,
+                    "skipped": stats.skipped,
+                    "total_seconds": stats.seconds,
+                    "mean_us": (
+                        stats.seconds / stats.evaluations * 1e6
+                        if stats.evaluations
+                        else 0.0
+                    ),
+                }
+                for (field, index), stats in items
+            ]
+
+    def index_report(self) -> Dict[str, int]:
+        """Returns the number of exact-match index hits per field, ordered by field."""
+        with self._lock:
+            return dict(sorted(self._index_hits.items()))
+
+    def dump(self, path: str) -> None:
+        """
+        Writes the pattern report, one pattern per entry, and the index hits
+        per field as indented JSON.
+        """
+        report = {"patterns": self.report(), "index_hits": self.index_report()}
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, sort_keys=True)
+            file.write("\n")
@@ -1,3 +1,6 @@
+from typing import List
+
+
 class UnbundlePatterns:
     """
     Register pattern to find unbundled field data
@@ -128,7 +131,7 @@ class TariffPatterns(UnbundlePatterns):
     CONTROLLED_LOAD = [
         "controlled_load",
         "controlled load",
-        "CL\d+",
+        r"CL\d+",
         "dedicated circuit",
     ]
     METERING_CHARGE = [
@@ -145,3 +148,11 @@ class TariffPatterns(UnbundlePatterns):
     DISCOUNT = ["discount"]
     DISCOUNT_FROM_LABEL = [r"[0-9]+%"]
     TOTAL_BEFORE_DISCOUNT = [r"electricity charge", r"gas charge", r"total charge"]
+
+
+def get_regex_patterns(field: str) -> List[str]:
+    """Get all regex patterns to find tariffs."""
+    try:
+        return getattr(TariffPatterns, field.upper())
+    except AttributeError:
+        raise Exception(f"Invalid field name: {field}")
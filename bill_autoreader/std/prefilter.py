@@ -0,0 +1,55 @@
+from typing import List, Optional
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+def _collect_literal_runs(items, runs: List[str], current: List[str]) -> None:
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            current.append(chr(av))
+            continue
+
+        # Any other node ends the current run of consecutive characters.
+        if current:
+            runs.append("".join(current))
+            current.clear()
+        if op is sre_parse.SUBPATTERN:
+            _collect_literal_runs(av[-1], runs, current)
+        elif op in (sre_parse.MAX_REPEAT, sre_parse.MIN_REPEAT) and av[0] >= 1:
+            _collect_literal_runs(av[2], runs, current)
+        else:
+            # Lookarounds, alternations, optional repeats, character classes
+            # and anchors do not contribute required literals.
+            continue
+        if current:
+            runs.append("".join(current))
+            current.clear()
+
+
+def required_literals(pattern: str) -> List[str]:
+    """
+    Extracts the lowercased literal substrings that every match of a pattern
+    must contain.
+
+    Only literals outside lookarounds, alternations and optional repeats are
+    collected, so a pattern that matches a text implies that each returned
+    literal occurs in the lowercased text. Literals with non-ASCII characters
+    are left out, since tariff names are ASCII-folded before matching.
+    """
+    runs: List[str] = []
+    current: List[str] = []
+    _collect_literal_runs(sre_parse.parse(pattern), runs, current)
+    if current:
+        runs.append("".join(current))
+    return [run.lower() for run in runs if run.isascii()]
+
+
+def longest_required_literal(pattern: str) -> Optional[str]:
+    """
+    Returns the most selective required literal of a pattern, or None when
+    the pattern has no required literal and must always be evaluated.
+    """
+    return max(required_literals(pattern), key=len, default=None)
@@ -0,0 +1,137 @@
+import re
+from typing import FrozenSet, Optional, Pattern, Tuple, Union
+from bill_autoreader.std.prefilter import required_literals
+from bill_autoreader.utils import NormalizedLabel
+
+_WORD = re.compile(r"\w+")
+_WORDS = re.compile(r"\w+(?: \w+)*")
+
+# ``(?!.*\bword\b)`` or ``(?!.*\b(?:word|other word|...)\b)`` right after ``^``.
+_NEGATIVE_LOOKAHEAD = re.compile(
+    r"\(\?!\.\*\\b(?:\(\?:(?P<alternatives>[^()]+)\)|(?P<alternative>[^()|]+))\\b\)"
+)
+# ``^[\.]*((?!(word|word)).)*literal``: the literal before any of the words.
+_TEMPERED_LITERAL = re.compile(
+    r"\^\[\\\.\]\*\(\(\?!\((?P<stops>\w+(?:\|\w+)*)\)\)\.\)\*(?P<literal>\w+)"
+)
+# Constructs that cannot be evaluated apart from the lookaheads.
+_UNSUPPORTED_REST = re.compile(r"\(\?[!=<]|\\[1-9]|\(\?P=")
+# An alternation bar inside a character class, which cannot be split on.
+_BAR_IN_CLASS = re.compile(r"\[[^\]]*\|")
+
+
+class ExclusionRule:
+    """
+    Token-based form of ``^(?!.*\\b(?:A|B|...)\\b)...rest`` patterns: the name
+    matches ``rest`` from its start and its first line contains none of the
+    excluded words or phrases. Patterns only see the first line through
+    ``.*``, and a word ``w`` is found by ``\\bw\\b`` exactly when it is one of
+    the words of that line.
+    """
+
+    __slots__ = ("excluded_words", "excluded_phrases", "rest")
+
+    def __init__(
+        self,
+        excluded_words: FrozenSet[str],
+        excluded_phrases: Tuple[Tuple[Tuple[str, ...], Pattern], ...],
+        rest: Pattern,
+    ):
+        self.excluded_words = excluded_words
+        self.excluded_phrases = excluded_phrases
+        self.rest = rest
+
+    def matches(self, label: NormalizedLabel) -> bool:
+        if not self.excluded_words.isdisjoint(label.tokens):
+            return False
+        first_line = label.first_line
+        for literals, phrase in self.excluded_phrases:
+            if all(literal in first_line for literal in literals) and phrase.search(
+                first_line
+            ):
+                return False
+        return self.rest.match(label.text) is not None
+
+
+class TemperedLiteralRule:
+    """
+    Token-based form of ``^[\\.]*((?!(A|B)).)*literal`` patterns: the first
+    line contains the literal, and none of the stop words starts before its
+    first occurrence.
+    """
+
+    __slots__ = ("stops", "literal")
+
+    def __init__(self, stops: Tuple[str, ...], literal: str):
+        self.stops = stops
+        self.literal = literal
+
+    def matches(self, label: NormalizedLabel) -> bool:
+        first_line = label.first_line
+        position = first_line.find(self.literal)
+        if position < 0:
+            return False
+        # Only stop words starting before the literal prevent the match.
+        return not any(
+            0 <= first_line.find(stop, 0, position + len(stop) - 1)
+            for stop in self.stops
+        )
+
+
+TokenRule = Union[ExclusionRule, TemperedLiteralRule]
+
+
+def _compile_exclusion_rule(pattern: str) -> Optional[ExclusionRule]:
+    if not pattern.startswith("^"):
+        return None
+    alternatives = []
+    position = 1
+    while True:
+        lookahead = _NEGATIVE_LOOKAHEAD.match(pattern, position)
+        if lookahead is None:
+            break
+        text = lookahead["alternatives"] or lookahead["alternative"]
+        if _BAR_IN_CLASS.search(text):
+            return None
+        alternatives.extend(text.split("|"))
+        position = lookahead.end()
+    rest = pattern[position:]
+    if not alternatives or _UNSUPPORTED_REST.search(rest):
+        return None
+
+    words = frozenset(
+        alternative.lower()
+        for alternative in alternatives
+        if _WORD.fullmatch(alternative)
+    )
+    phrases = []
+    for alternative in alternatives:
+        if _WORD.fullmatch(alternative):
+            continue
+        # A phrase of plain words is already excluded by any of its words.
+        if _WORDS.fullmatch(alternative) and not words.isdisjoint(
+            alternative.lower().split(" ")
+        ):
+            continue
+        phrases.append(
+            (
+                tuple(required_literals(alternative)),
+                re.compile(rf"\b(?:{alternative})\b", re.IGNORECASE),
+            )
+        )
+    return ExclusionRule(words, tuple(phrases), re.compile(rest, re.IGNORECASE))
+
+
+def compile_token_rule(pattern: str) -> Optional[TokenRule]:
+    """
+    Translates a negative-lookahead pattern into a rule evaluated on the words
+    of the tariff name, or returns None when the pattern has no such form and
+    must be evaluated as a regex.
+    """
+    tempered = _TEMPERED_LITERAL.fullmatch(pattern)
+    if tempered is not None:
+        return TemperedLiteralRule(
+            tuple(stop.lower() for stop in tempered["stops"].split("|")),
+            tempered["literal"].lower(),
+        )
+    return _compile_exclusion_rule(pattern)
@@ -1,6 +1,10 @@
 from datetime import date, timedelta
-from typing import Union, List, Any, Optional
+from typing import Union, List, Any, Optional, FrozenSet, Sequence
+import re
 import unicodedata
+import numpy as np
+from bill_autoreader.constants import SUMMER_DEMAND, NONSUMMER_DEMAND, SUMMER_MONTHS
+from decimal import InvalidOperation
 
 
 def normalize_list(value):
@@ -28,9 +32,53 @@ def convert_to_boolean(value):
 
 
 def normalize_string(s):
+    if s.isascii():
+        # NFKD leaves ASCII untouched, so most labels skip unicodedata entirely
+        return s
     return unicodedata.normalize("NFKD", s).encode("ascii", "ignore").decode("ascii")
 
 
+_WORD = re.compile(r"\w+")
+
+
+class NormalizedLabel:
+    """
+    A label normalized once and shared by every matcher that needs it.
+
+    Attributes:
+    - raw (str): The original label.
+    - text (str): The ASCII-folded label, as returned by ``normalize_string``.
+    - lowered (str): The lowercased ASCII-folded label.
+    - first_line (str): The part of ``lowered`` before the first line break,
+      which is all that ``.*`` can reach in a regex.
+    - tokens (FrozenSet[str]): The words of ``first_line``, computed on first use.
+    """
+
+    __slots__ = ("raw", "text", "lowered", "_first_line", "_tokens")
+
+    def __init__(self, raw: str):
+        self.raw = raw
+        self.text = normalize_string(raw)
+        self.lowered = self.text.lower()
+        self._first_line = None
+        self._tokens = None
+
+    @property
+    def first_line(self) -> str:
+        if self._first_line is None:
+            self._first_line = self.lowered.split("\n", 1)[0]
+        return self._first_line
+
+    @property
+    def tokens(self) -> FrozenSet[str]:
+        if self._tokens is None:
+            self._tokens = frozenset(_WORD.findall(self.first_line))
+        return self._tokens
+
+    def __repr__(self) -> str:
+        return f"NormalizedLabel({self.raw!r})"
+
+
 def days_between_dates_inclusive(start_date: date, end_date: date) -> int:
     """
     Calculate the number of days between two dates, inclusive of both start and end dates.
@@ -85,6 +133,220 @@ def calculate_months_between_dates(
     )
 
 
+_NONE_DEMAND_STRINGS = ("", "999")
+
+
+def is_none_demand(value: Any) -> bool:
+    """
+    Whether a demand value is one of the "no demand" sentinels of ``NONE_DEMAND``:
+    None, "", "999", or a number equal to 0 or 999. Unlike ``value in NONE_DEMAND``,
+    any NaN counts, not only the ``nan`` objects listed there.
+
+    Parameters:
+    - value (Any): A usage, price or subtotal of a demand row.
+
+    Returns:
+    - bool: True if the value means the row has no demand.
+    """
+    if value is None:
+        return True
+    if isinstance(value, str):
+        return value in _NONE_DEMAND_STRINGS
+    try:
+        return value != value or value == 0 or value == 999
+    except InvalidOperation:
+        # Signaling Decimal NaNs refuse comparisons
+        return True
+
+
+def _as_demand_values(values: Union[np.ndarray, Sequence[Any]]) -> np.ndarray:
+    if isinstance(values, np.ndarray):
+        return values
+    array = np.asarray(values)
+    if array.dtype.kind in "US":
+        # Numbers mixed with strings would be turned into strings
+        array = np.empty(len(values), dtype=object)
+        array[:] = list(values)
+    return array
+
+
+def is_none_demand_array(values: Union[np.ndarray, Sequence[Any]]) -> np.ndarray:
+    """
+    Vectorized ``is_none_demand`` over a column of demand values, numeric or
+    mixed scalars (None, strings, Decimals, floats...).
+
+    Parameters:
+    - values (Union[np.ndarray, Sequence[Any]]): Demand values.
+
+    Returns:
+    - np.ndarray: A boolean array, True where a value means no demand.
+    """
+    values = _as_demand_values(values)
+    kind = values.dtype.kind
+    if kind == "b":
+        return ~values
+    if kind in "iu":
+        return (values == 0) | (values == 999)
+    if kind in "fc":
+        return np.isnan(values) | (values == 0) | (values == 999)
+    if kind in "US":
+        return (values == "") | (values == "999")
+    try:
+        return (
+            np.equal(values, None)
+            | (values != values)
+            | (values == 0)
+            | (values == 999)
+            | (values == "")
+            | (values == "999")
+        ).astype(bool)
+    except InvalidOperation:
+        return np.frompyfunc(is_none_demand, 1, 1)(values).astype(bool)
+
+
+def to_demand_array(values: Union[np.ndarray, Sequence[Any]]) -> np.ndarray:
+    """
+    Converts demand values to a float64 array, with NaN for the values
+    that mean no demand (see ``is_none_demand``). Strings converting to 0 or
+    999, such as " 999" or "999.0", also mean no demand once converted.
+    """
+    values = _as_demand_values(values)
+    none_demand = is_none_demand_array(values)
+    if values.dtype.kind not in "biuf":
+        values = values.astype(object)
+        values[none_demand] = np.nan
+    demand = values.astype(float)
+    demand[none_demand] = np.nan
+    demand[is_none_demand_array(demand)] = np.nan
+    return demand
+
+
+DateArray = Union[np.ndarray, Sequence[Optional[date]]]
+
+
+def to_datetime64_days(dates: DateArray) -> np.ndarray:
+    """
+    Converts dates, ISO date strings or ``datetime64`` values to a ``datetime64[D]`` array,
+    None becoming NaT.
+    """
+    return np.asarray(dates, dtype="datetime64[D]")
+
+
+def _month_numbers(dates: np.ndarray) -> np.ndarray:
+    """Number of months since January 1970 of each ``datetime64[D]`` date."""
+    return dates.astype("datetime64[M]").astype(np.int64)
+
+
+def _check_date_order(start_dates: np.ndarray, end_dates: np.ndarray) -> None:
+    # Comparisons with NaT are False, so missing dates are never out of order
+    if np.any(start_dates > end_dates):
+        raise ValueError("Start date must be before or on the same day as end date.")
+
+
+def days_between_dates_inclusive_array(
+    start_dates: DateArray, end_dates: DateArray
+) -> np.ndarray:
+    """
+    Vectorized ``days_between_dates_inclusive`` over columns of billing periods.
+
+    Parameters:
+    - start_dates (DateArray): The starting dates.
+    - end_dates (DateArray): The ending dates.
+
+    Returns:
+    - np.ndarray: The inclusive number of days of each period, 0 where a date is missing (NaT).
+    """
+    start_dates = to_datetime64_days(start_dates)
+    end_dates = to_datetime64_days(end_dates)
+    delta = end_dates - start_dates
+    days = delta.astype(np.int64) + 1
+    days[np.isnat(delta)] = 0
+    return days
+
+
+def calculate_end_date_array(
+    start_dates: DateArray, supply_days: Union[int, Sequence[int]]
+) -> np.ndarray:
+    """
+    Vectorized ``calculate_end_date`` over columns of billing periods.
+
+    Parameters:
+    - start_dates (DateArray): The starting dates.
+    - supply_days (int or Sequence[int]): The number of days to add, shared or per date.
+
+    Returns:
+    - np.ndarray: The ``datetime64[D]`` end dates, NaT where the start date is missing.
+    """
+    return to_datetime64_days(start_dates) + np.asarray(
+        supply_days, dtype="timedelta64[D]"
+    )
+
+
+def calculate_months_between_dates_array(
+    start_dates: DateArray, end_dates: DateArray
+) -> np.ndarray:
+    """
+    Vectorized ``calculate_months_between_dates`` over columns of billing periods.
+
+    Parameters:
+    - start_dates (DateArray): Start dates.
+    - end_dates (DateArray): End dates.
+
+    Returns:
+    - np.ndarray: Number of complete months of each period, 0 where a date is missing (NaT).
+    """
+    start_dates = to_datetime64_days(start_dates)
+    end_dates = to_datetime64_days(end_dates)
+    months = _month_numbers(end_dates) - _month_numbers(start_dates) + 1
+    months[np.isnat(start_dates) | np.isnat(end_dates)] = 0
+    return months
+
+
+def is_summer_period_array(start_dates: DateArray, end_dates: DateArray) -> np.ndarray:
+    """
+    Vectorized summer test of ``demand.classify_demand_period``: True where a period
+    starts and ends in ``SUMMER_MONTHS`` of the same summer.
+
+    Parameters:
+    - start_dates (DateArray): Start dates.
+    - end_dates (DateArray): End dates.
+
+    Returns:
+    - np.ndarray: A boolean array, False where a date is missing (NaT).
+
+    Raises:
+    - ValueError: If a start date is after its end date.
+    """
+    start_dates = to_datetime64_days(start_dates)
+    end_dates = to_datetime64_days(end_dates)
+    _check_date_order(start_dates, end_dates)
+
+    start_months = _month_numbers(start_dates)
+    end_months = _month_numbers(end_dates)
+    start_month, end_month = start_months % 12 + 1, end_months % 12 + 1
+    summer_months = np.array(SUMMER_MONTHS)
+    in_summer = np.isin(start_month, summer_months) & np.isin(end_month, summer_months)
+    from_december = (start_month == 12) & np.isin(end_month, summer_months[1:])
+    same_year = start_months // 12 == end_months // 12
+    is_summer = in_summer & (from_december | same_year)
+    is_summer[np.isnat(start_dates) | np.isnat(end_dates)] = False
+    return is_summer
+
+
+def classify_demand_period_array(
+    start_dates: DateArray, end_dates: DateArray
+) -> np.ndarray:
+    """
+    Vectorized ``demand.classify_demand_period``, labelling each period
+    SUMMER_DEMAND or NONSUMMER_DEMAND (also where a date is missing).
+    """
+    return np.where(
+        is_summer_period_array(start_dates, end_dates),
+        SUMMER_DEMAND,
+        NONSUMMER_DEMAND,
+    ).astype(object)
+
+
 def to_list(value: Union[Any, List[Any], None]) -> List[Any]:
     """
     Converts a single value into a list if it's not already a list and filters out None values.
@@ -0,0 +1,115 @@
+import pytest
+from bill_autoreader.std import (
+    LabelCache,
+    TariffClassifier,
+    disable_label_cache,
+    enable_label_cache,
+    get_classifier,
+    identify_tariffs,
+    label_cache_info,
+    map_to_standardize_tariffs,
+    refresh_classifiers,
+)
+from bill_autoreader.std.patterns import TariffPatterns
+from bill_autoreader.constants import PEAK, SHOULDER, SUPPLY_CHARGE
+
+
+def test_lru_eviction_and_statistics():
+    cache = LabelCache(maxsize=2)
+    cache.put(("energy_consumption", "a"), PEAK)
+    cache.put(("energy_consumption", "b"), None)
+    assert cache.get(("energy_consumption", "a")) == PEAK  # "b" is now oldest
+    cache.put(("energy_consumption", "c"), SUPPLY_CHARGE)
+
+    assert cache.get(("energy_consumption", "b"), "missing") == "missing"
+    info = cache.info()
+    assert (info.hits, info.misses, info.evictions, info.size) == (1, 1, 1, 2)
+    assert info.hit_rate == 0.5
+
+
+def test_invalid_maxsize():
+    with pytest.raises(ValueError):
+        LabelCache(maxsize=0)
+
+
+def test_bind_invalidates_changed_group_only():
+    cache = LabelCache()
+    cache.bind("energy_consumption", "v1")
+    cache.bind("market_tariff", "v1")
+    cache.put(("energy_consumption", "Peak"), PEAK)
+    cache.put(("market_tariff", "LRET"), "LRET")
+
+    cache.bind("energy_consumption", "v1")
+    assert len(cache) == 2
+    cache.bind("energy_consumption", "v2")
+    assert len(cache) == 1
+
+
+def test_classifier_caches_unmatched_tariffs():
+    cache = LabelCache()
+    classifier = TariffClassifier(cache=cache)
+    assert classifier.classify("Unknown Tariff") is None
+    assert classifier.classify("Unknown Tariff") is None
+    assert cache.info().hits == 1
+
+
+def test_refresh_picks_up_changed_patterns(monkeypatch):
+    cache = LabelCache()
+    classifier = TariffClassifier(retailers_tariffs=None, cache=cache)
+    assert classifier.classify("Happy Hour") is None
+    assert classifier.refresh() is False
+
+    monkeypatch.setattr(TariffPatterns, "PEAK", TariffPatterns.PEAK + ["happy hour"])
+    assert classifier.refresh() is True
+    assert classifier.classify("Happy Hour") == PEAK
+
+
+@pytest.mark.parametrize("cached", [False, True])
+def test_shared_classifiers_pick_up_changed_patterns(monkeypatch, cached):
+    try:
+        if cached:
+            enable_label_cache()
+        assert map_to_standardize_tariffs(["Happy Hour"]) == {"Happy Hour": None}
+
+        monkeypatch.setattr(
+            TariffPatterns, "PEAK", TariffPatterns.PEAK + ["happy hour"]
+        )
+        assert refresh_classifiers() == ["energy_consumption"]
+        assert identify_tariffs(["Happy Hour"], PEAK) == ["Happy Hour"]
+        assert map_to_standardize_tariffs(["Happy Hour"]) == {"Happy Hour": PEAK}
+
+        monkeypatch.undo()
+        assert "energy_consumption" in refresh_classifiers()
+        assert refresh_classifiers() == []
+        assert get_classifier().classify("Happy Hour") is None
+    finally:
+        disable_label_cache()
+
+
+def test_refresh_rebuilds_the_label_index(monkeypatch):
+    classifier = TariffClassifier()
+    assert classifier.classify("Shoulder") == SHOULDER
+    assert classifier.index_hits == 1
+
+    monkeypatch.setattr(TariffPatterns, "SHOULDER", ["retail - shoulder"])
+    assert classifier.refresh() is True
+    assert identify_tariffs(["Shoulder"], SHOULDER) == []
+    patterns_only = TariffClassifier(retailers_tariffs=None)
+    assert classifier.classify("Shoulder") == patterns_only.classify("Shoulder")
+    assert classifier.classify("Shoulder") != SHOULDER
+    assert classifier.label_index
+    for label, std_tariff in classifier.label_index.items():
+        assert patterns_only.classify(label) == std_tariff
+
+
+def test_shared_label_cache():
+    try:
+        cache = enable_label_cache(maxsize=10)
+        assert get_classifier().cache is cache
+        map_to_standardize_tariffs(["Peak", "Peak Usage"])
+        map_to_standardize_tariffs(["Peak"])
+        assert label_cache_info().hits == 1
+    finally:
+        disable_label_cache()
+    assert get_classifier().cache is None
+    assert label_cache_info() is None
@@ -0,0 +1,123 @@
+import gc
+import threading
+import warnings
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from bill_autoreader.std import (
+    TariffClassifier,
+    get_classifier,
+    identify_tariffs,
+    map_to_standardize_tariffs,
+)
+from bill_autoreader.std.retailer import collect_all_tariffs, RETAILERS_TARIFFS
+from bill_autoreader.constants import (
+    ENERGY_CONSUMPTION_TARIFF,
+    PEAK,
+    OFF_PEAK,
+    SUPPLY_CHARGE,
+)
+
+ALL_TARIFFS = collect_all_tariffs(RETAILERS_TARIFFS)
+
+
+def legacy_map_to_standardize_tariffs(tariffs):
+    """Field-by-field standardization, kept as the reference behaviour."""
+    tariff_mapping = {}
+    remaining_tariffs = list(tariffs)
+    for standard_tariff in ENERGY_CONSUMPTION_TARIFF:
+        matched_tariffs = identify_tariffs(remaining_tariffs, standard_tariff)
+        for tariff in matched_tariffs:
+            tariff_mapping[tariff] = standard_tariff
+        remaining_tariffs = [
+            tariff for tariff in remaining_tariffs if tariff not in matched_tariffs
+        ]
+    for tariff in remaining_tariffs:
+        tariff_mapping[tariff] = None
+    return tariff_mapping
+
+
+@pytest.mark.parametrize(
+    "tariff, expected",
+    [
+        ("Peak Usage", PEAK),
+        ("Off Peak Usage", OFF_PEAK),
+        ("Daily Supply Charge", SUPPLY_CHARGE),
+        ("Off Peak Demand", OFF_PEAK),  # also matches unknown demand
+        ("Unknown Tariff", None),
+    ],
+)
+def test_classify(tariff, expected):
+    assert TariffClassifier().classify(tariff) == expected
+
+
+def test_classify_many_matches_legacy_standardization():
+    assert TariffClassifier().classify_many(
+        ALL_TARIFFS
+    ) == legacy_map_to_standardize_tariffs(ALL_TARIFFS)
+
+
+def test_classify_many_deduplicates():
+    result = TariffClassifier().classify_many(["Next", "Next", "First"])
+    assert result == {"Next": PEAK, "First": PEAK}
+
+
+def test_get_classifier_is_shared():
+    assert get_classifier("energy_consumption") is get_classifier()
+
+
+def test_map_to_standardize_tariffs_uses_classifier():
+    assert map_to_standardize_tariffs(ALL_TARIFFS) == get_classifier().classify_many(
+        ALL_TARIFFS
+    )
+
+
+def test_unknown_tariff_group():
+    with pytest.raises(KeyError):
+        TariffClassifier("non_existent_group")
+
+
+def test_label_index_agrees_with_patterns():
+    indexed = TariffClassifier()
+    patterns_only = TariffClassifier(retailers_tariffs=None)
+    assert indexed.label_index
+    for label, std_tariff in indexed.label_index.items():
+        assert patterns_only.classify(label) == std_tariff
+
+
+def test_label_index_counters():
+    classifier = TariffClassifier()
+    assert classifier.classify("DAILY SUPPLY CHARGE") == SUPPLY_CHARGE
+    assert classifier.classify("Daily Supply Charge (kWh)") == SUPPLY_CHARGE
+    assert (classifier.index_hits, classifier.index_misses) == (1, 1)
+    assert classifier.index_hit_rate == 0.5
+
+
+def test_classify_from_many_threads():
+    classifier = TariffClassifier()
+    tariffs = ALL_TARIFFS * 20
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(classifier.classify, tariffs))
+    assert results == [classifier.classify(tariff) for tariff in tariffs]
+    assert classifier.index_hits + classifier.index_misses == 2 * len(tariffs)
+
+
+def test_index_counters_of_ended_threads_are_folded():
+    classifier = TariffClassifier()
+    threads = [
+        threading.Thread(target=classifier.classify, args=("Daily Supply Charge",))
+        for _ in range(200)
+    ]
+    for thread in threads:
+        thread.start()
+        thread.join()
+    gc.collect()
+    assert len(classifier._counter_registry) == 0
+    assert (classifier.index_hits, classifier.index_misses) == (200, 0)
+    classifier.classify("Daily Supply Charge (kWh)")
+    assert (classifier.index_hits, classifier.index_misses) == (200, 1)
+
+
+def test_map_to_standardize_tariffs_leaves_warning_filters_alone():
+    filters = list(warnings.filters)
+    map_to_standardize_tariffs(["Peak Usage", "Unknown Tariff"])
+    assert warnings.filters == filters
@@ -0,0 +1,78 @@
+import pytest
+from datetime import date, datetime
+from bill_autoreader.dates import (
+    BillingDateParser,
+    compile_date_format,
+    detect_date_format,
+    parse_date,
+)
+from bill_autoreader.std.patterns import TariffPatterns
+
+SAMPLE_DATES = [date(2024, 3, 5), date(1999, 12, 31), date(2023, 2, 28)]
+
+
+def strptime_or_none(value, date_format):
+    try:
+        return datetime.strptime(value, date_format).date()
+    except ValueError:
+        return None
+
+
+@pytest.mark.parametrize("date_format", TariffPatterns.START_DATE)
+def test_parse_date_matches_strptime(date_format):
+    values = [d.strftime(date_format) for d in SAMPLE_DATES] + [
+        "5 Mar 2024",
+        "05 MARCH 2024",
+        "05-mar-24",
+        "5/3/2024",
+        "31 Feb 2024",
+        "05 Mar 2024 extra",
+        "2024-03-05",
+        "",
+    ]
+    for value in values:
+        assert parse_date(value, date_format) == strptime_or_none(value, date_format)
+
+
+def test_unsupported_directive():
+    with pytest.raises(ValueError):
+        compile_date_format("%d %H")
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("05 Mar 2024", "%d %b %Y"),
+        ("05/03/2024", "%d/%m/%Y"),
+        ("05032024", "%d%m%Y"),
+        ("05 March 2024", "%d %B %Y"),
+        ("March 5, 2024", None),
+    ],
+)
+def test_detect_date_format(value, expected):
+    assert detect_date_format(value) == expected
+
+
+def test_parser_caches_format_per_key():
+    parser = BillingDateParser()
+    assert parser.parse("05/03/2024", key="agl") == date(2024, 3, 5)
+    assert parser.cached_format("agl") == "%d/%m/%Y"
+    assert parser.cached_format("origin") is None
+
+    # A date in another format is detected again and replaces the cached one
+    assert parser.parse("06 Mar 2024", key="agl") == date(2024, 3, 6)
+    assert parser.cached_format("agl") == "%d %b %Y"
+
+
+def test_parse_many():
+    parser = BillingDateParser()
+    values = ["01-Jan-2024", " 31-Jan-2024 ", None, "", "not a date", date(2024, 2, 1)]
+    assert parser.parse_many(values, key="origin") == [
+        date(2024, 1, 1),
+        date(2024, 1, 31),
+        None,
+        None,
+        None,
+        date(2024, 2, 1),
+    ]
+    assert parser.cached_format("origin") == "%d-%b-%Y"
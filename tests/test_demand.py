@@ -1,13 +1,32 @@
+import math
+from decimal import Decimal
+import random
+import numpy as np
 import pytest
-from datetime import date
+from datetime import date, timedelta
 from bill_autoreader.demand import (
     demand_price_unit,
+    demand_price_unit_array,
+    get_demand_structure_batch,
+    get_demand_multiplier,
+    demand_multiplier_array,
+    DemandRecord,
+    get_demand_record_structure,
+    DemandStructureAccumulator,
+    add_demand_hook,
+    remove_demand_hook,
+    demand_tracing,
+    split_billing_period,
+    split_billing_periods,
+    BillingPeriodSegment,
+    DEMAND_PRICE_UNITS,
     DemandPriceUnitEnum,
     is_monthly_demand,
     get_demand_structure,
     classify_demand_period,
 )
 from bill_autoreader.constants import SUMMER_DEMAND, NONSUMMER_DEMAND
+from bill_autoreader.utils import to_list, calculate_months_between_dates
 from tests.data.demand import (
     sample_demand_data_monthly_per_usage_per_day,
     sample_demand_non_monthly_per_usage_per_day,
@@ -58,6 +77,64 @@ def test_demand_price_unit_price_per_usage_per_day_wo_billing_days_with_varied_l
     )
 
 
+def _random_demand_rows(n, seed=0):
+    rng = random.Random(seed)
+    rows = []
+    for _ in range(n):
+        usage = round(rng.uniform(0, 200), 2)
+        price = round(rng.uniform(0, 1), 4)
+        loss_factor = rng.choice([1, 0.9, 1.05])
+        days = rng.choice([None, 0, 1, 14, 30, 31])
+        subtotal = usage * price * loss_factor * rng.choice(
+            [1, 1, days or 30, 1.5, 0]
+        ) + rng.choice([0, 0.004, 0.01, 0.0100001, -0.02, 1e-12])
+        rows.append((usage, price, subtotal, days, loss_factor))
+    # Exact boundaries of the absolute tolerance, zeros and non-finite values
+    rows += [
+        (1.0, 1.0, 1.01, None, 1),
+        (1.0, 1.0, 1.01, 30, 1),
+        (1.0, 1.0, 30.01, 30, 1),
+        (0.0, 0.0, 0.0, 30, 1),
+        (1.0, math.inf, math.inf, None, 1),
+        (1.0, math.inf, math.inf, 30, 1),
+        (1.0, math.nan, 1.0, 30, 1),
+        (1e200, 1e200, 1.0, 30, 1),
+    ]
+    return rows
+
+
+def test_demand_price_unit_array_matches_scalar():
+    rows = _random_demand_rows(2000)
+    usages, prices, subtotals, days, loss_factors = map(list, zip(*rows))
+    expected = [
+        demand_price_unit(*row[:3], billing_days=row[3], loss_factor=row[4])
+        for row in rows
+    ]
+    codes = demand_price_unit_array(
+        usages, prices, subtotals, billing_days=days, loss_factor=loss_factors
+    )
+    assert [DEMAND_PRICE_UNITS[code] for code in codes] == expected
+
+    codes = demand_price_unit_array(usages, prices, subtotals, loss_factor=loss_factors)
+    assert [DEMAND_PRICE_UNITS[code] for code in codes] == [
+        demand_price_unit(*row[:3], loss_factor=row[4]) for row in rows
+    ]
+
+
+def test_demand_price_unit_array_shared_billing_days():
+    codes = demand_price_unit_array(
+        np.array([89.38, 19, 19]),
+        np.array([0.3081, 0.3711, 0.3711]),
+        np.array([27.54, 98.72, 50.0]),
+        billing_days=14,
+    )
+    assert [DEMAND_PRICE_UNITS[code] for code in codes] == [
+        DemandPriceUnitEnum.price_per_usage,
+        DemandPriceUnitEnum.price_per_usage_per_day,
+        DemandPriceUnitEnum.unknown,
+    ]
+
+
 # Is Monthly Demand
 def test_is_monthly_demand_with_correct_months():
     # Case where the number of demands matches the number of months exactly
@@ -113,6 +190,398 @@ def test_demand_structure_with_multipliers(case):
     assert result == expected
 
 
+def _to_demand_table(bills):
+    """Flattens per-bill get_demand_structure inputs into batch columns."""
+    table = {key: [] for key in ["bill_id", "is_summer", "usage", "price", "subtotal"]}
+    for bill_id, params in bills.items():
+        for is_summer, demand in [
+            (False, params["nonsummer_demand"]),
+            (True, params["summer_demand"]),
+        ]:
+            for usage, price, subtotal in zip(
+                *(to_list(demand[key]) for key in ["usage", "price", "subtotal"])
+            ):
+                table["bill_id"].append(bill_id)
+                table["is_summer"].append(is_summer)
+                table["usage"].append(usage)
+                table["price"].append(price)
+                table["subtotal"].append(subtotal)
+    return table
+
+
+def _get_demand_structure_batch(bills, shuffle_seed=None):
+    table = _to_demand_table(bills)
+    columns = list(zip(*table.values()))
+    if shuffle_seed is not None:
+        # Rows of different bills or seasons may be interleaved
+        # (summer rows possibly first), keeping the order within each season.
+        rng = random.Random(shuffle_seed)
+        ranks, seen = [], {}
+        for row in columns:
+            ranks.append(seen.setdefault(row[:2], 0))
+            seen[row[:2]] += 1
+        keys = [(rank, rng.random()) for rank in ranks]
+        columns = [row for _, row in sorted(zip(keys, columns))]
+        table = dict(zip(table, map(list, zip(*columns))))
+    return get_demand_structure_batch(
+        table["bill_id"],
+        table["is_summer"],
+        table["usage"],
+        table["price"],
+        table["subtotal"],
+        start_dates={k: v.get("start_date") for k, v in bills.items()},
+        end_dates={k: v.get("end_date") for k, v in bills.items()},
+        loss_factors={k: v.get("loss_factor", 1.0) for k, v in bills.items()},
+    )
+
+
+def _random_bill(rng):
+    n_nonsummer, n_summer = rng.choice([(1, 0), (0, 1), (1, 1), (2, 1), (3, 3)])
+    days = rng.choice([1, 10, 30, 31])
+    per_day = rng.random() < 0.6
+    loss_factor = rng.choice([1.0, 0.95])
+
+    def demand(n):
+        usages = [round(rng.uniform(1, 300), 2) for _ in range(n)]
+        prices = [round(rng.uniform(0.01, 20), 4) for _ in range(n)]
+        subtotals = [
+            round(u * p * loss_factor * (days if per_day else 1), 2)
+            + rng.choice([0, 0, 0.5])
+            for u, p in zip(usages, prices)
+        ]
+        return {"usage": usages, "price": prices, "subtotal": subtotals}
+
+    start_date = date(2024, rng.randint(1, 12), rng.randint(1, 28))
+    return {
+        "nonsummer_demand": demand(n_nonsummer),
+        "summer_demand": demand(n_summer),
+        "start_date": start_date,
+        "end_date": rng.choice([start_date, date(2025, 1, 31), date(2025, 3, 1)]),
+        "loss_factor": loss_factor,
+    }
+
+
+@pytest.mark.parametrize("shuffle_seed", [None, 1])
+def test_demand_structure_batch_matches_per_bill(shuffle_seed):
+    rng = random.Random(0)
+    bills = {f"bill-{i}": _random_bill(rng) for i in range(300)}
+    cases = (
+        sample_demand_data_monthly_per_usage_per_day
+        + sample_demand_non_monthly_per_usage_per_day
+        + sample_demand_per_usage
+    )
+    bills.update({f"sample-{i}": case["input"] for i, case in enumerate(cases)})
+    bills["no-dates"] = {
+        **bills["bill-0"],
+        "start_date": None,
+        "end_date": None,
+    }
+
+    expected = {
+        bill_id: get_demand_structure(**params) for bill_id, params in bills.items()
+    }
+    result = _get_demand_structure_batch(bills, shuffle_seed)
+    assert result == expected
+    assert {r["price_unit"] for r in result.values()} == {
+        DemandPriceUnitEnum.price_per_usage,
+        DemandPriceUnitEnum.price_per_usage_per_day,
+    }
+    if shuffle_seed is None:
+        assert list(result) == list(bills)
+
+
+def test_demand_structure_batch_keeps_bill_id_types():
+    bill_ids = [("acct", 1), 1, "1", ("acct", 1), 1.5]
+    result = get_demand_structure_batch(
+        bill_ids, [False] * 5, [100] * 5, [10] * 5, [1000] * 5
+    )
+    assert list(result) == [("acct", 1), 1, "1", 1.5]
+    assert result[("acct", 1)]["monthly_demand"] is True
+
+
+def test_demand_structure_batch_multiplier_rounding():
+    # Ratios just below an integer round up to it before truncation
+    ratios = [2.995, 2.994, 2.9951, 3.0, 3.004, -2.995, 12.0]
+    bills = {
+        i: {
+            "nonsummer_demand": {"usage": 1, "price": 1, "subtotal": ratio},
+            "summer_demand": {"usage": None, "price": None, "subtotal": None},
+            "start_date": date(2024, 1, 1),
+            "end_date": date(2024, 1, 31),
+        }
+        for i, ratio in enumerate(ratios)
+    }
+    result = _get_demand_structure_batch(bills)
+    for i, ratio in enumerate(ratios):
+        assert result[i] == get_demand_structure(**bills[i])
+
+
+def test_demand_structure_batch_leaves_out_failing_bills():
+    # get_demand_structure raises on "a" and "c", whose other bills are kept
+    errors = {}
+    result = get_demand_structure_batch(
+        ["a", "a", "b", "c"],
+        [False, True, False, False],
+        [0, 10, 100, 10],
+        [10, 10, 10, 10],
+        [500, 3000, 12000, float("nan")],
+        errors=errors,
+    )
+    assert list(result) == ["b"]
+    assert result["b"]["multipliers"] == {"nonsummer": [12], "summer": []}
+    assert list(errors) == ["a", "c"]
+    assert isinstance(errors["a"], ZeroDivisionError)
+    assert isinstance(errors["c"], ValueError)
+    with pytest.raises(ZeroDivisionError):
+        get_demand_structure(
+            {"usage": 0, "price": 10, "subtotal": 500},
+            {"usage": 10, "price": 10, "subtotal": 3000},
+            None,
+            None,
+        )
+    # Bills priced per usage never compute multipliers
+    assert get_demand_structure_batch(["a"], [False], [0], [10], [0]) == {
+        "a": {
+            "monthly_demand": True,
+            "price_unit": DemandPriceUnitEnum.price_per_usage,
+            "multipliers": None,
+        }
+    }
+    assert get_demand_structure_batch([], [], [], [], []) == {}
+
+
+def test_demand_multiplier_array_matches_get_demand_multiplier():
+    rng = random.Random(0)
+    usages = [round(rng.uniform(0.5, 300), 2) for _ in range(2000)]
+    prices = [round(rng.uniform(0.01, 20), 4) for _ in range(2000)]
+    subtotals = [
+        round(u * p * rng.choice([1, 12, 30, 31]), 2) + rng.choice([0, 0.05, -0.05])
+        for u, p in zip(usages, prices)
+    ]
+    # Ratios rounding up to an integer at 2 decimals
+    usages += [1, 1, 1]
+    prices += [1, 1, 1]
+    subtotals += [2.995, 2.9951, -2.9951]
+
+    multipliers, valid = demand_multiplier_array(usages, prices, subtotals)
+    assert valid.all()
+    assert multipliers.tolist() == get_demand_multiplier(usages, prices, subtotals)
+
+
+def test_demand_multiplier_array_masks_missing_rows():
+    nan = float("nan")
+    multipliers, valid = demand_multiplier_array(
+        [100, 0, 999, None, 100, 100, 100, 1e-300],
+        [10, 10, 10, 10, nan, 999, 10, 1e-300],
+        [12000, 500, 500, 500, 500, 500, 0, 1.0],
+    )
+    assert valid.tolist() == [True] + [False] * 7
+    assert multipliers.tolist() == [12] + [0] * 7
+    assert multipliers.dtype == np.int64
+
+    # Mixed sentinels of NONE_DEMAND, as found in extracted bills
+    multipliers, valid = demand_multiplier_array(
+        [100, "999", "", Decimal(999), "100"],
+        [10, 10, 10, 10, Decimal("10")],
+        [12000, 500, 500, 500, 3000],
+    )
+    assert valid.tolist() == [True, False, False, False, True]
+    assert multipliers.tolist() == [12, 0, 0, 0, 3]
+
+
+def test_demand_record_structure_matches_per_bill():
+    rng = random.Random(2)
+    bills = [_random_bill(rng) for _ in range(300)]
+    bills += [
+        case["input"]
+        for case in sample_demand_data_monthly_per_usage_per_day
+        + sample_demand_non_monthly_per_usage_per_day
+        + sample_demand_per_usage
+    ]
+    for params in bills:
+        record = DemandRecord.from_demand(
+            params["nonsummer_demand"], params["summer_demand"]
+        )
+        assert get_demand_record_structure(
+            record,
+            params["start_date"],
+            params["end_date"],
+            params.get("loss_factor", 1.0),
+        ) == get_demand_structure(**params)
+
+
+@pytest.mark.parametrize(
+    "subtotals, usages",
+    [
+        ([math.nan, 100], [150, 0]),
+        ([math.inf, 100], [150, 0]),
+        ([100, math.nan], [0, 150]),
+    ],
+)
+def test_demand_record_structure_raises_on_the_first_failing_row(subtotals, usages):
+    params = {
+        "nonsummer_demand": {"usage": usages, "price": [15, 15], "subtotal": subtotals},
+        "summer_demand": {"usage": [100], "price": [10], "subtotal": [12000]},
+        "start_date": date(2024, 3, 20),
+        "end_date": date(2024, 4, 10),
+    }
+    with pytest.raises(Exception) as expected:
+        get_demand_structure(**params)
+    record = DemandRecord.from_demand(
+        params["nonsummer_demand"], params["summer_demand"]
+    )
+    with pytest.raises(expected.type):
+        get_demand_record_structure(record, params["start_date"], params["end_date"])
+
+
+def test_demand_record_columns_are_not_copied():
+    usage = np.array([150.0, 100.0, 10.0])
+    record = DemandRecord(
+        usage, [15, 10, 10], [22500, 12000, 1000], [False, True, True]
+    )
+    assert record.usage is usage
+    summer_usage, summer_price, summer_subtotal = record.season(summer=True)
+    assert np.shares_memory(summer_usage, usage)
+    assert summer_usage.tolist() == [100.0, 10.0]
+    assert record.to_demand() == (
+        {"usage": [150.0], "price": [15.0], "subtotal": [22500.0]},
+        {"usage": [100.0, 10.0], "price": [10.0, 10.0], "subtotal": [12000.0, 1000.0]},
+    )
+
+
+def test_demand_record_orders_nonsummer_first():
+    record = DemandRecord([1, 2, 3], [1, 1, 1], [30, 60, 90], [True, False, True])
+    assert record.usage.tolist() == [2, 1, 3]
+    assert record.is_summer.tolist() == [False, True, True]
+    assert len(record) == 3
+    with pytest.raises(ValueError):
+        DemandRecord.from_demand(
+            {"usage": [1, 2], "price": [1], "subtotal": [1, 2]},
+            {"usage": None, "price": None, "subtotal": None},
+        )
+
+
+def test_demand_record_drops_none_demand():
+    record = DemandRecord.from_demand(
+        {"usage": [150, "999", None], "price": [15, 10, 10], "subtotal": [22500, 0, 5]},
+        {"usage": 100, "price": 10, "subtotal": 12000},
+        drop_none_demand=True,
+    )
+    assert record.to_demand() == (
+        {"usage": [150.0], "price": [15.0], "subtotal": [22500.0]},
+        {"usage": [100.0], "price": [10.0], "subtotal": [12000.0]},
+    )
+    assert record.drop_none_demand() is record
+
+    record = DemandRecord([0, 100, 999], [10, 10, 10], [10, 12000, 5], True)
+    assert record.drop_none_demand().usage.tolist() == [100.0]
+
+
+def test_demand_structure_accumulator_matches_full_recompute():
+    rng = random.Random(3)
+    for _ in range(100):
+        bill = _random_bill(rng)
+        rows = [
+            (*values, is_summer)
+            for is_summer, demand in [
+                (False, bill["nonsummer_demand"]),
+                (True, bill["summer_demand"]),
+            ]
+            for values in zip(demand["usage"], demand["price"], demand["subtotal"])
+        ]
+        rng.shuffle(rows)
+        accumulator = DemandStructureAccumulator(
+            bill["start_date"], bill["end_date"], bill["loss_factor"]
+        )
+        seen = []
+        for row in rows:
+            accumulator.add(*row)
+            seen.append(row)
+            demand = {
+                is_summer: {
+                    key: [r[i] for r in seen if r[3] == is_summer]
+                    for i, key in enumerate(["usage", "price", "subtotal"])
+                }
+                for is_summer in (False, True)
+            }
+            assert accumulator.result() == get_demand_structure(
+                demand[False],
+                demand[True],
+                bill["start_date"],
+                bill["end_date"],
+                bill["loss_factor"],
+            )
+        assert len(accumulator) == len(rows)
+
+
+def test_demand_structure_accumulator_extends_period_and_raises():
+    accumulator = DemandStructureAccumulator(date(2024, 3, 20), date(2024, 3, 31))
+    assert accumulator.result()["monthly_demand"] is False
+    accumulator.add(100, 10, 12000, is_summer=True)
+    assert accumulator.result()["monthly_demand"] is True
+
+    accumulator.set_period(date(2024, 3, 20), date(2024, 4, 10))
+    accumulator.extend([(150, 15, 22500, False)])
+    assert (
+        accumulator.result()
+        == sample_demand_data_monthly_per_usage_per_day[0]["expected"]
+    )
+
+    # A zero usage only fails once the bill is priced per usage per day
+    accumulator.add(0, 10, 0)
+    assert accumulator.price_unit == DemandPriceUnitEnum.price_per_usage
+    assert accumulator.result()["multipliers"] is None
+    accumulator = DemandStructureAccumulator()
+    accumulator.add(0, 10, 500)
+    with pytest.raises(ZeroDivisionError):
+        accumulator.result()
+
+
+def test_demand_structure_does_not_write_to_stdout(capsys):
+    get_demand_structure(**sample_demand_data_monthly_per_usage_per_day[0]["input"])
+    assert capsys.readouterr().out == ""
+
+
+def test_demand_tracing_hook_receives_events():
+    case = sample_demand_data_monthly_per_usage_per_day[0]
+    events = []
+    with demand_tracing(events.append):
+        result = get_demand_structure(**case["input"])
+    get_demand_structure(**case["input"])
+
+    assert [(event.name, event.data.get("demand_name")) for event in events] == [
+        ("demand_multipliers", "nonsummer"),
+        ("demand_multipliers", "summer"),
+        ("demand_structure", None),
+    ]
+    assert events[0].data["demand"] == case["input"]["nonsummer_demand"]
+    assert events[0].seconds is None
+    assert events[-1].data["result"] == result == case["expected"]
+    assert events[-1].data["start_date"] == case["input"]["start_date"]
+    assert events[-1].seconds >= 0
+
+
+def test_demand_hooks_add_and_remove():
+    first, second = [], []
+    add_demand_hook(first.append)
+    add_demand_hook(second.append)
+    try:
+        get_demand_structure_batch(["a", "b"], [False, True], [1, 2], [3, 4], [3, 8])
+        remove_demand_hook(first.append)
+        get_demand_structure(**sample_demand_per_usage[0]["input"])
+    finally:
+        remove_demand_hook(first.append)
+        remove_demand_hook(second.append)
+    get_demand_structure(**sample_demand_per_usage[0]["input"])
+
+    assert [event.name for event in first] == ["demand_structure_batch"]
+    assert first[0].data == {"n_bills": 2, "n_rows": 2}
+    assert [event.name for event in second] == [
+        "demand_structure_batch",
+        "demand_structure",
+    ]
+
+
 # classify demand period
 def test_within_summer_months():
     # Test dates fully within summer months
@@ -146,3 +615,66 @@ def test_invalid_date_order():
     # Optionally test behavior for date ranges where start date is after end date
     with pytest.raises(ValueError):
         classify_demand_period(date(2023, 5, 10), date(2023, 4, 1))
+
+
+# split billing period
+def test_split_billing_period_across_seasons():
+    # The billing period of the sample demand data: 12 summer and 10 non-summer days
+    assert split_billing_period(date(2024, 3, 20), date(2024, 4, 10)) == [
+        BillingPeriodSegment(date(2024, 3, 20), date(2024, 3, 31), 12, SUMMER_DEMAND),
+        BillingPeriodSegment(date(2024, 4, 1), date(2024, 4, 10), 10, NONSUMMER_DEMAND),
+    ]
+
+
+def test_split_billing_period_single_day_and_year_end():
+    assert split_billing_period(date(2024, 2, 29), date(2024, 2, 29)) == [
+        BillingPeriodSegment(date(2024, 2, 29), date(2024, 2, 29), 1, SUMMER_DEMAND)
+    ]
+    segments = split_billing_period(date(2023, 11, 15), date(2024, 1, 15))
+    assert [segment.days for segment in segments] == [16, 31, 15]
+    assert [segment.season for segment in segments] == [
+        NONSUMMER_DEMAND,
+        SUMMER_DEMAND,
+        SUMMER_DEMAND,
+    ]
+    with pytest.raises(ValueError):
+        split_billing_period(date(2023, 5, 10), date(2023, 4, 1))
+
+
+def test_split_billing_periods_matches_per_period():
+    rng = random.Random(0)
+    starts = [
+        date(2020, 1, 1) + timedelta(days=rng.randrange(5 * 365)) for _ in range(500)
+    ]
+    ends = [
+        start + timedelta(days=rng.choice([0, 1, 30, 31, 95, 400])) for start in starts
+    ]
+    segments = split_billing_periods(starts + [None], ends + [None])
+
+    expected = [
+        (period, *segment)
+        for period, (start, end) in enumerate(zip(starts, ends))
+        for segment in split_billing_period(start, end)
+    ]
+    assert (
+        list(
+            zip(
+                segments.period.tolist(),
+                segments.start_date.tolist(),
+                segments.end_date.tolist(),
+                segments.days.tolist(),
+                segments.season.tolist(),
+            )
+        )
+        == expected
+    )
+    assert np.bincount(segments.period, minlength=len(starts) + 1).tolist() == [
+        calculate_months_between_dates(start, end) for start, end in zip(starts, ends)
+    ] + [0]
+
+
+def test_split_billing_periods_empty_and_invalid():
+    segments = split_billing_periods([], [])
+    assert len(segments.period) == 0 and len(segments.days) == 0
+    with pytest.raises(ValueError):
+        split_billing_periods([date(2023, 5, 10)], [date(2023, 4, 1)])
@@ -1,11 +1,16 @@
+import random
+import numpy as np
 import pytest
 from bill_autoreader.evaluation import (
+    _has_perfect_matching,
     match_retailer,
     match_site_identity,
     match_additional_tariff,
+    match_additional_tariff_batch,
     match_divide_demand,
     match_monthly_demand_multiplier,
     match_read_type,
+    standardize_string,
 )
 
 
@@ -144,6 +149,76 @@ def test_match_additional_price_label(
     )
 
 
+def test_match_additional_tariff_is_one_to_one():
+    # Both predicted tariffs resemble the same actual one only
+    assert not match_additional_tariff(
+        ["Meter Fee", "Meter Fee"],
+        [1.0, 1.0],
+        ["meter fee", "admin charge"],
+        [1.0, 1.0],
+    )
+    # "Meter Fee" resembles both, but "meter fee" must go to "Meter Fe"
+    assert match_additional_tariff(
+        ["Meter Fee", "Meter Fe"],
+        [1.0, 1.0],
+        ["meter fee", "meter fees"],
+        [1.0, 1.0],
+        threshold=90,
+    )
+    assert match_additional_tariff([], [], [], [])
+
+
+def test_match_additional_tariff_compares_mixed_prices_like_python():
+    assert match_additional_tariff(["Meter Fee"], [1], ["meter fee"], [1.0])
+    assert not match_additional_tariff(["Meter Fee"], ["1.0"], ["meter fee"], [1.0])
+    assert match_additional_tariff(
+        ["Meter Fee", "Admin Fee"], [None, 2], ["admin fee", "meter fee"], [2, None]
+    )
+    assert not match_additional_tariff(
+        ["Meter Fee"], [float("nan")], ["meter fee"], [float("nan")]
+    )
+
+
+def test_match_additional_tariff_with_long_augmenting_paths():
+    n = 2000
+    # Row i resembles columns i and i + 1 but the last row only column 0, so
+    # assigning it shifts every earlier row by one column
+    allowed = np.zeros((n, n), dtype=bool)
+    allowed[np.arange(n - 1), np.arange(n - 1)] = True
+    allowed[np.arange(n - 1), np.arange(1, n)] = True
+    allowed[n - 1, 0] = True
+    assert _has_perfect_matching(allowed)
+    # Nobody can take the last column any more: the search fails at the end
+    allowed[n - 2, n - 1] = False
+    assert not _has_perfect_matching(allowed)
+
+    labels = [f"fee {i}" for i in range(n)]
+    prices = [float(i) for i in range(n)]
+    assert match_additional_tariff(labels, prices, labels[::-1], prices[::-1])
+
+
+def test_match_additional_tariff_batch_matches_per_bill():
+    labels = ["Network Charge", "Meter Fee", "Admin Fee", "Late Payment Fee", None]
+    rng = random.Random(0)
+    bills = []
+    for _ in range(300):
+        actual_labels = rng.sample(labels, rng.randint(0, 3))
+        actual_prices = [rng.choice([1.5, 2.0]) for _ in actual_labels]
+        predicted_labels = [
+            rng.choice([label, str(label).upper(), "Other Fee"])
+            for label in actual_labels
+        ]
+        predicted_prices = rng.choice([actual_prices, actual_prices[::-1], [1.5]])
+        bills.append((predicted_labels, predicted_prices, actual_labels, actual_prices))
+
+    expected = [match_additional_tariff(*bill) for bill in bills]
+    assert match_additional_tariff_batch(*zip(*bills)) == expected
+    assert 0 < sum(expected) < len(bills)
+    assert match_additional_tariff_batch(
+        ["Meter Fee"], [1.0], ["meter_fee"], [1.0]
+    ) == [True]
+
+
 @pytest.mark.parametrize(
     "predicted_value, actual_value, expected",
     [
@@ -235,3 +310,16 @@ def test_match_monthly_demand_multiplier(predicted_price, actual_price, expected
 )
 def test_match_read_type(predicted_value, actual_value, expected):
     assert match_read_type(predicted_value, actual_value) == expected
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        (None, ""),
+        (12, "12"),
+        (" Off_Peak Usage ", "off peak usage"),
+        ("Café_Fee", "café fee"),
+    ],
+)
+def test_standardize_string(value, expected):
+    assert standardize_string(value) == expected
@@ -0,0 +1,117 @@
+import random
+import pytest
+from bill_autoreader.constants import ADDITIONAL_LABEL, ADDITIONAL_PRICE
+from bill_autoreader.evaluation import (
+    match_additional_tariff,
+    match_divide_demand,
+    match_retailer,
+    match_site_identity,
+)
+from bill_autoreader.evaluation.batch import (
+    FieldAccuracy,
+    evaluate_records,
+    match_record,
+)
+
+RETAILERS = ["AGL", "Origin Energy", "Win Energy", "Red Energy Pty Ltd", "Alinta"]
+
+
+def make_records(n, seed=0):
+    rng = random.Random(seed)
+    predicted, actual = [], []
+    for i in range(n):
+        labels = rng.sample(["Network Charge", "Meter Fee", "Admin Fee"], 2)
+        prices = [rng.choice([1.5, 2.0]) for _ in labels]
+        actual.append(
+            {
+                "site_identity": f"{6001234567 + i}",
+                "retailer": rng.choice(RETAILERS),
+                "divide_demand": rng.choice([True, False]),
+                ADDITIONAL_LABEL: labels,
+                ADDITIONAL_PRICE: prices,
+            }
+        )
+        predicted.append(
+            {
+                "site_identity": rng.choice([f"{6001234567 + i}", "6009999999"]),
+                "retailer": rng.choice(RETAILERS + ["winconnect", None]),
+                "divide_demand": rng.choice(["yes", "no", "maybe"]),
+                ADDITIONAL_LABEL: [label.upper() for label in labels],
+                ADDITIONAL_PRICE: rng.choice([prices, prices[::-1]]),
+            }
+        )
+    return predicted, actual
+
+
+def expected_accuracy(predicted, actual):
+    matches = {
+        "site_identity": [
+            match_site_identity(p["site_identity"], a["site_identity"])
+            for p, a in zip(predicted, actual)
+        ],
+        "retailer": [
+            match_retailer(p["retailer"], a["retailer"])
+            for p, a in zip(predicted, actual)
+        ],
+        "additional_tariff": [
+            match_additional_tariff(
+                p[ADDITIONAL_LABEL],
+                p[ADDITIONAL_PRICE],
+                a[ADDITIONAL_LABEL],
+                a[ADDITIONAL_PRICE],
+            )
+            for p, a in zip(predicted, actual)
+        ],
+        "divide_demand": [
+            match_divide_demand(p["divide_demand"], a["divide_demand"])
+            for p, a in zip(predicted, actual)
+        ],
+    }
+    return {
+        field: FieldAccuracy(len(values), sum(values), 0, sum(values) / len(values))
+        for field, values in matches.items()
+    }
+
+
+def test_evaluate_records_matches_per_value_matchers():
+    predicted, actual = make_records(300)
+    result = evaluate_records(predicted, actual, chunk_size=64)
+    assert result == expected_accuracy(predicted, actual)
+    assert list(result) == [
+        "site_identity",
+        "retailer",
+        "additional_tariff",
+        "divide_demand",
+    ]
+    assert 0 < result["additional_tariff"].matched < 300
+
+
+def test_evaluate_records_process_pool_is_deterministic():
+    predicted, actual = make_records(500, seed=1)
+    assert evaluate_records(
+        predicted, actual, max_workers=2, chunk_size=37
+    ) == evaluate_records(predicted, actual)
+
+
+def test_evaluate_records_missing_fields_and_errors():
+    predicted = [{"retailer": "AGL"}, {"retailer": "AGL"}, {}]
+    actual = [{"retailer": "AGL"}, {"retailer": None}, {"site_identity": "6001"}]
+    result = evaluate_records(predicted, actual, fields=["retailer", "site_identity"])
+    # A matcher raising counts as a mismatch
+    assert result["retailer"] == FieldAccuracy(2, 1, 1, 0.5)
+    assert result["site_identity"] == FieldAccuracy(1, 0, 0, 0.0)
+    assert evaluate_records([], [])["retailer"] == FieldAccuracy(0, 0, 0, None)
+
+
+def test_match_record():
+    assert match_record({"retailer": "AGL"}, {"retailer": "AGL Energy"}, "retailer")
+    assert match_record({}, {}, "additional_tariff") is None
+
+
+def test_evaluate_records_invalid_arguments():
+    with pytest.raises(ValueError):
+        evaluate_records([{}], [])
+    with pytest.raises(ValueError):
+        evaluate_records([{}], [{}], chunk_size=0)
+    with pytest.raises(KeyError):
+        evaluate_records([{}], [{}], fields=["unknown_field"])
@@ -0,0 +1,69 @@
+import json
+from bill_autoreader.std import (
+    PatternProfiler,
+    TariffClassifier,
+    disable_pattern_profiler,
+    enable_pattern_profiler,
+    get_classifier,
+    map_to_standardize_tariffs,
+)
+from bill_autoreader.std.patterns import TariffPatterns
+from bill_autoreader.constants import OFF_PEAK, PEAK, SUPPLY_CHARGE
+
+
+def test_profiler_records_evaluations_and_matches():
+    profiler = PatternProfiler()
+    classifier = TariffClassifier(retailers_tariffs=None, profiler=profiler)
+    assert classifier.classify("Supply Charge") == SUPPLY_CHARGE
+    assert classifier.classify("Peak Usage") == PEAK
+
+    report = {(entry["field"], entry["index"]): entry for entry in profiler.report()}
+    supply = report[(SUPPLY_CHARGE, TariffPatterns.SUPPLY_CHARGE.index("^supply"))]
+    assert supply["pattern"] == "^supply"
+    assert (supply["evaluations"], supply["matches"]) == (1, 1)
+    assert supply["total_seconds"] >= 0
+
+    # "^daily" requires "daily", absent from both names
+    daily = report[(SUPPLY_CHARGE, TariffPatterns.SUPPLY_CHARGE.index("^daily"))]
+    assert (daily["evaluations"], daily["skipped"]) == (0, 2)
+
+
+def test_profiler_dump(tmp_path):
+    profiler = PatternProfiler()
+    TariffClassifier(retailers_tariffs=None, profiler=profiler).classify("Peak")
+    path = tmp_path / "patterns.json"
+    profiler.dump(str(path))
+    assert json.loads(path.read_text()) == {
+        "patterns": profiler.report(),
+        "index_hits": {},
+    }
+
+    profiler.reset()
+    assert profiler.report() == []
+
+
+def test_profiler_sees_index_hits():
+    profiler = PatternProfiler()
+    classifier = TariffClassifier(profiler=profiler)
+    labels = ["Daily Supply Charge", "Peak Usage", "Off Peak Usage"] * 1000
+    unprofiled = TariffClassifier()
+    assert [classifier.classify(label) for label in labels] == [
+        unprofiled.classify(label) for label in labels
+    ]
+    assert classifier.index_hits == len(labels)
+
+    assert profiler.index_report() == {OFF_PEAK: 1000, PEAK: 1000, SUPPLY_CHARGE: 1000}
+    assert sum(entry["matches"] for entry in profiler.report()) == len(labels)
+    profiler.reset()
+    assert profiler.index_report() == {}
+
+
+def test_shared_pattern_profiler():
+    try:
+        profiler = enable_pattern_profiler()
+        assert get_classifier().profiler is profiler
+        map_to_standardize_tariffs(["Summer Usage Plan"])
+        assert any(entry["evaluations"] for entry in profiler.report())
+    finally:
+        disable_pattern_profiler()
+    assert get_classifier().profiler is None
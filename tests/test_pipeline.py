@@ -0,0 +1,132 @@
+import json
+import pytest
+from bill_autoreader.pipeline import (
+    read_line_items,
+    standardize_bills,
+    stream_standardized_bills,
+)
+from bill_autoreader.std import map_to_standardize_tariffs
+from bill_autoreader.constants import PEAK, SUPPLY_CHARGE
+
+LINE_ITEMS = [
+    {"bill_id": "A", "label": "Peak Usage", "usage": 10, "price": 0.3, "subtotal": 3},
+    {
+        "bill_id": "A",
+        "label": "Daily Supply Charge",
+        "usage": 30,
+        "price": 1,
+        "subtotal": 30,
+    },
+    {
+        "bill_id": "B",
+        "label": "Unknown Tariff",
+        "usage": None,
+        "price": 5,
+        "subtotal": 5,
+    },
+]
+
+
+@pytest.fixture
+def jsonl_path(tmp_path):
+    path = tmp_path / "line_items.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in LINE_ITEMS) + "\n\n")
+    return str(path)
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "line_items.csv"
+    rows = ["bill_id,label,usage,price,subtotal"] + [
+        ",".join("" if row[k] is None else str(row[k]) for k in row)
+        for row in LINE_ITEMS
+    ]
+    path.write_text("\n".join(rows) + "\n")
+    return str(path)
+
+
+@pytest.mark.parametrize("path_fixture", ["jsonl_path", "csv_path"])
+def test_read_line_items(path_fixture, request):
+    rows = list(read_line_items(request.getfixturevalue(path_fixture)))
+    assert [row["label"] for row in rows] == [row["label"] for row in LINE_ITEMS]
+    assert rows[0]["usage"] == 10.0
+    assert rows[2]["usage"] is None
+
+
+def test_read_line_items_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        list(read_line_items(str(tmp_path / "line_items.txt")))
+
+
+@pytest.mark.parametrize("label", [None, 12, ["Peak Usage"]])
+def test_read_line_items_rejects_bad_labels(tmp_path, label):
+    rows = [dict(LINE_ITEMS[0]), dict(LINE_ITEMS[1], label=label)]
+    if label is None:
+        del rows[1]["label"]
+    path = tmp_path / "line_items.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\n")
+    with pytest.raises(ValueError, match="Line 2 "):
+        list(read_line_items(str(path)))
+
+
+def test_read_line_items_rejects_csv_without_labels(tmp_path):
+    path = tmp_path / "line_items.csv"
+    path.write_text("bill_id,usage\nA,10\n")
+    with pytest.raises(ValueError, match="Line 1 .* no label column"):
+        list(read_line_items(str(path)))
+
+
+def test_read_line_items_skips_the_byte_order_mark(tmp_path):
+    path = tmp_path / "line_items.csv"
+    path.write_text("bill_id,label\nA,Peak Usage\n", encoding="utf-8-sig")
+    assert [row["bill_id"] for row in read_line_items(str(path))] == ["A"]
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("label,usage\nPeak Usage,10\n", "Line 1 .* no bill_id column"),
+        ("bill_id,label\nA,Peak Usage\n,Off Peak Usage\n", "Line 3 .* no bill_id"),
+        ('bill_id,label,usage\nA,Peak Usage,"1,200"\n', "Line 2 .* usage"),
+    ],
+)
+def test_read_line_items_rejects_bad_csv(tmp_path, text, message):
+    path = tmp_path / "line_items.csv"
+    path.write_text(text)
+    with pytest.raises(ValueError, match=message):
+        list(read_line_items(str(path)))
+
+
+@pytest.mark.parametrize(
+    "line, message",
+    [
+        ('{"label": "Peak Usage"}', "no bill_id"),
+        ('{"bill_id": "B", "label": "Peak Usage", "price": "n/a"}', "price"),
+        ('{"bill_id": "B", "label": "Peak Usage", "price": [1]}', "price"),
+        ('["B", "Peak Usage"]', "not a JSON object"),
+        ('{"bill_id": "B",', "not valid JSON"),
+    ],
+)
+def test_read_line_items_rejects_bad_jsonl(tmp_path, line, message):
+    path = tmp_path / "line_items.jsonl"
+    path.write_text(json.dumps(LINE_ITEMS[0]) + "\n" + line + "\n")
+    with pytest.raises(ValueError, match=f"Line 2 .*{message}"):
+        list(read_line_items(str(path)))
+
+
+def test_standardize_bills():
+    bills = list(standardize_bills(iter(LINE_ITEMS)))
+    assert [bill["bill_id"] for bill in bills] == ["A", "B"]
+    assert [row["std_tariff"] for row in bills[0]["line_items"]] == [
+        PEAK,
+        SUPPLY_CHARGE,
+    ]
+    assert bills[1]["tariffs"] == map_to_standardize_tariffs(["Unknown Tariff"])
+
+
+def test_stream_standardized_bills(jsonl_path, csv_path):
+    from_jsonl = list(stream_standardized_bills(jsonl_path))
+    from_csv = list(stream_standardized_bills(csv_path))
+    assert [bill["tariffs"] for bill in from_jsonl] == [
+        bill["tariffs"] for bill in from_csv
+    ]
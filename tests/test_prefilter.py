@@ -0,0 +1,43 @@
+import pytest
+from bill_autoreader.std.prefilter import required_literals, longest_required_literal
+from bill_autoreader.std.classifier import compile_prefiltered_patterns
+from bill_autoreader.std.retailer import collect_all_tariffs, RETAILERS_TARIFFS
+from bill_autoreader.constants import ENERGY_CONSUMPTION_TARIFF, UNBUNDLED
+from bill_autoreader.utils import normalize_string
+
+ALL_TARIFFS = collect_all_tariffs(RETAILERS_TARIFFS) + [
+    "Off-Peak CL1 Usage",
+    "Non Summer Winter Demand",
+    "Peak Offer Winter",
+    "Solar Metering Charge",
+]
+
+
+@pytest.mark.parametrize(
+    "pattern, expected",
+    [
+        ("Gas Daily Charge", ["gas daily charge"]),
+        (r"supply\s*charge", ["supply", "charge"]),
+        ("(CMG)*Supply Charge", ["supply charge"]),
+        ("(vic|cmg) off-peak", [" off-peak"]),
+        (r"^(?!.*\b(?:off|summer)\b).*peak\b.*(usage|energy)", ["peak"]),
+        (r"^[\.]*((?!(off|peak)).)*winter", ["winter"]),
+        (r"^step[1-5]$", ["step"]),
+        (r"[0-9]+%", ["%"]),
+    ],
+)
+def test_required_literals(pattern, expected):
+    assert required_literals(pattern) == expected
+
+
+def test_longest_required_literal_without_literal():
+    assert longest_required_literal(r"\d+") is None
+
+
+@pytest.mark.parametrize("field", ENERGY_CONSUMPTION_TARIFF + [UNBUNDLED])
+def test_required_literal_occurs_in_every_match(field):
+    for literal, pattern, _ in compile_prefiltered_patterns(field):
+        for tariff in ALL_TARIFFS:
+            name = normalize_string(tariff)
+            if pattern.search(name):
+                assert literal is None or literal in name.lower()
@@ -0,0 +1,62 @@
+import re
+import pytest
+from bill_autoreader.std.patterns import TariffPatterns
+from bill_autoreader.std.retailer import collect_all_tariffs, RETAILERS_TARIFFS
+from bill_autoreader.std.rules import (
+    ExclusionRule,
+    TemperedLiteralRule,
+    compile_token_rule,
+)
+from bill_autoreader.utils import NormalizedLabel
+
+LOOKAHEAD_PATTERNS = [
+    pattern
+    for field in vars(TariffPatterns).values()
+    if isinstance(field, list)
+    for pattern in field
+    if "(?!" in pattern
+]
+
+TARIFFS = collect_all_tariffs(RETAILERS_TARIFFS) + [
+    "Offpeak Usage",
+    "Offpeak  Usage",
+    "Shoulder Usage Peak",
+    "Standard Offpeak Usage",
+    "Non-Summer Demand",
+    "Non  Summer Peak",
+    "Summer Peak Demand",
+    "Peak Usage\nOff Peak",
+    "Off Peak\nPeak Usage",
+    "Winter Peak Demand",
+    "Peak Winter Demand",
+    "..winter offer",
+    "Solar Metering Charge",
+    "Meter Charge (solar)",
+    "Capacity High Season Demand",
+    "* Flexi Plan (Home) Peak Consumption (1.39990 kWh/day)^ " + "x " * 50,
+]
+
+
+def test_every_lookahead_pattern_has_a_token_rule():
+    assert LOOKAHEAD_PATTERNS
+    for pattern in LOOKAHEAD_PATTERNS:
+        assert compile_token_rule(pattern) is not None, pattern
+
+
+@pytest.mark.parametrize("pattern", LOOKAHEAD_PATTERNS)
+def test_token_rule_matches_regex(pattern):
+    rule = compile_token_rule(pattern)
+    regex = re.compile(pattern, re.IGNORECASE)
+    for tariff in TARIFFS:
+        label = NormalizedLabel(tariff)
+        expected = regex.search(label.text) is not None
+        assert rule.matches(label) == expected, tariff
+
+
+def test_rule_kinds():
+    assert isinstance(compile_token_rule(r"^(?!.*\bsolar\b).*meter"), ExclusionRule)
+    assert isinstance(
+        compile_token_rule(r"^[\.]*((?!(off|peak)).)*winter"), TemperedLiteralRule
+    )
+    assert compile_token_rule("supply charge") is None
+    assert compile_token_rule(r"^(?!.*\bsolar\b)(?=.*x).*meter") is None
@@ -3,6 +3,8 @@ from bill_autoreader.std import (
     get_regex_patterns,
     identify_tariffs,
     map_to_standardize_tariffs,
+    map_to_standardize_tariffs_batch,
+    map_to_standardize_tariffs_bulk,
 )
 from bill_autoreader.std.patterns import TariffPatterns
 from bill_autoreader.std.retailer import collect_all_tariffs, RETAILERS_TARIFFS
@@ -113,3 +115,40 @@ class TestStandardizeTariffs:
         tariff_group = "non_existent_group"
         with pytest.raises(KeyError):
             map_to_standardize_tariffs(tariffs, tariff_group)
+
+
+class TestStandardizeTariffsBatch:
+
+    def test_batch_matches_per_bill(self):
+        bills = [
+            ["Peak Usage", "Off Peak Usage", "Unknown Tariff"],
+            ["First", "Next", "Next", "Supply Charge"],
+            [],
+            ALL_TARIFFS,
+        ]
+        result = map_to_standardize_tariffs_batch(bills, "energy_consumption")
+        assert result == [map_to_standardize_tariffs(tariffs) for tariffs in bills]
+
+    def test_non_existent_group(self):
+        with pytest.raises(KeyError):
+            map_to_standardize_tariffs_batch([["Peak Usage"]], "non_existent_group")
+
+
+class TestStandardizeTariffsBulk:
+
+    def test_bulk_matches_single_process(self):
+        tariffs = ALL_TARIFFS + ["Unknown Tariff", "Peak Usage"]
+        result = map_to_standardize_tariffs_bulk(tariffs, max_workers=2, chunk_size=7)
+        assert result == map_to_standardize_tariffs(tariffs)
+        assert list(result) == list(dict.fromkeys(tariffs))
+
+    def test_empty_tariff_list(self):
+        assert map_to_standardize_tariffs_bulk([]) == {}
+
+    def test_invalid_chunk_size(self):
+        with pytest.raises(ValueError):
+            map_to_standardize_tariffs_bulk(["Peak"], chunk_size=0)
+
+    def test_non_existent_group(self):
+        with pytest.raises(KeyError):
+            map_to_standardize_tariffs_bulk(["Peak"], "non_existent_group")
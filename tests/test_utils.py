@@ -1,6 +1,26 @@
-from bill_autoreader.utils import calculate_months_between_dates, normalize_string
+from bill_autoreader.utils import (
+    NormalizedLabel,
+    calculate_end_date,
+    calculate_end_date_array,
+    calculate_months_between_dates,
+    calculate_months_between_dates_array,
+    classify_demand_period_array,
+    days_between_dates_inclusive,
+    days_between_dates_inclusive_array,
+    is_none_demand,
+    is_none_demand_array,
+    is_summer_period_array,
+    normalize_string,
+    to_demand_array,
+)
+from bill_autoreader.demand import classify_demand_period
+from bill_autoreader.constants import NONE_DEMAND, NONSUMMER_DEMAND
+from decimal import Decimal
+import math
+import random
+import numpy as np
 import pytest
-from datetime import date
+from datetime import date, timedelta
 
 
 @pytest.mark.parametrize(
@@ -45,3 +65,136 @@ def test_normalize_string(input_string, expected_output):
     assert (
         normalize_string(input_string) == expected_output
     ), f"Failed on input: {input_string}"
+
+
+def test_normalized_label():
+    label = NormalizedLabel("Café Peak-Usage\nOff Peak")
+    assert label.text == "Cafe Peak-Usage\nOff Peak"
+    assert label.lowered == "cafe peak-usage\noff peak"
+    assert label.first_line == "cafe peak-usage"
+    assert label.tokens == {"cafe", "peak", "usage"}
+
+
+def test_normalized_label_ascii_fast_path():
+    raw = "Daily Supply Charge"
+    assert NormalizedLabel(raw).text is raw
+    assert not hasattr(NormalizedLabel(raw), "__dict__")
+
+
+def _random_periods(n, seed=0):
+    rng = random.Random(seed)
+    starts, ends = [], []
+    for _ in range(n):
+        start = date(2020, 1, 1) + timedelta(days=rng.randrange(5 * 365))
+        starts.append(start)
+        ends.append(start + timedelta(days=rng.choice([0, 1, 27, 31, 95, 400])))
+    return starts, ends
+
+
+def test_calendar_arrays_match_scalar_functions():
+    starts, ends = _random_periods(3000)
+    supply_days = [(end - start).days for start, end in zip(starts, ends)]
+
+    assert calculate_months_between_dates_array(starts, ends).tolist() == [
+        calculate_months_between_dates(*period) for period in zip(starts, ends)
+    ]
+    assert days_between_dates_inclusive_array(starts, ends).tolist() == [
+        days_between_dates_inclusive(*period) for period in zip(starts, ends)
+    ]
+    assert calculate_end_date_array(starts, supply_days).tolist() == [
+        calculate_end_date(*args) for args in zip(starts, supply_days)
+    ]
+    assert classify_demand_period_array(starts, ends).tolist() == [
+        classify_demand_period(*period) for period in zip(starts, ends)
+    ]
+
+
+def test_calendar_arrays_accept_datetime64_and_missing_dates():
+    starts = np.array(["2023-12-25", "NaT", "2024-01-10"], dtype="datetime64[D]")
+    ends = [date(2024, 1, 5), date(2024, 2, 1), None]
+
+    assert calculate_months_between_dates_array(starts, ends).tolist() == [2, 0, 0]
+    assert days_between_dates_inclusive_array(starts, ends).tolist() == [12, 0, 0]
+    assert is_summer_period_array(starts, ends).tolist() == [True, False, False]
+    assert classify_demand_period_array(starts, ends)[1] == NONSUMMER_DEMAND
+    assert calculate_end_date_array(starts, 10).tolist() == [
+        date(2024, 1, 4),
+        None,
+        date(2024, 1, 20),
+    ]
+
+
+def test_is_summer_period_array_invalid_date_order():
+    with pytest.raises(ValueError):
+        is_summer_period_array(
+            [date(2023, 4, 1), date(2023, 5, 10)],
+            [date(2023, 4, 2), date(2023, 4, 1)],
+        )
+
+
+DEMAND_VALUES = [
+    *NONE_DEMAND,
+    0.0,
+    -0.0,
+    999.0,
+    False,
+    np.int64(999),
+    np.float64(0),
+    Decimal("0.00"),
+    float("nan"),
+    Decimal("NaN"),
+    "0",
+    " 999",
+    "nan",
+    1,
+    True,
+    12.5,
+    Decimal("1.5"),
+    "12.5",
+    [],
+]
+
+
+def test_is_none_demand_mirrors_none_demand_and_any_nan():
+    for value in DEMAND_VALUES:
+        is_nan = isinstance(value, (float, Decimal)) and value != value
+        assert is_none_demand(value) == (value in NONE_DEMAND or is_nan), value
+    assert is_none_demand(Decimal("sNaN"))
+
+
+def test_is_none_demand_array_matches_scalar():
+    values = DEMAND_VALUES[:-1]
+    assert is_none_demand_array(values).tolist() == [
+        is_none_demand(value) for value in values
+    ]
+    assert is_none_demand_array(values + [Decimal("sNaN")]).tolist()[-1]
+    # Homogeneous columns take the typed paths
+    numbers = np.array([0, 1, 999, np.nan, 2.5])
+    assert is_none_demand_array(numbers).tolist() == [True, False, True, True, False]
+    assert is_none_demand_array(np.array([0, 5, 999])).tolist() == [True, False, True]
+    assert is_none_demand_array(np.array(["", "999", "0"])).tolist() == [
+        True,
+        True,
+        False,
+    ]
+    assert is_none_demand_array(["999", 0, 5]).tolist() == [True, True, False]
+
+
+def test_to_demand_array():
+    demand = to_demand_array([None, "999", "", 0, 12.5, "7", Decimal("1.5")])
+    assert demand.dtype == np.float64
+    assert [None if math.isnan(v) else v for v in demand.tolist()] == [
+        None,
+        None,
+        None,
+        None,
+        12.5,
+        7.0,
+        1.5,
+    ]
+
+
+def test_to_demand_array_masks_converted_sentinels():
+    demand = to_demand_array([" 999", "999.0", "0.0", " 7 ", np.nan])
+    assert np.isnan(demand).tolist() == [True, True, True, False, True]
+    assert demand[3] == 7.0